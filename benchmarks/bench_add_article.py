@@ -0,0 +1,66 @@
+"""Latency of adding one article as the author's collection grows.
+
+    python -m benchmarks.bench_add_article --sizes 0 1000 10000 50000
+"""
+import argparse
+
+from blog.adapters.orm import articles
+from blog.domain import commands
+from blog.domain.models import Article, ArticleStatus, get_new_uuid
+from blog.services.handlers import add_article, create_user
+from blog.services.unit_of_work import BlogUnitOfWork
+from benchmarks.common import bench_session_factory, timed, percentile
+
+
+def seed_articles(session_factory, user_id, count, chunk_size=5000):
+    session = session_factory()
+    for start in range(0, count, chunk_size):
+        session.execute(articles.insert(), [
+            dict(
+                id=get_new_uuid(),
+                title="title",
+                description="description",
+                content="content",
+                status=ArticleStatus.DRAFT,
+                user_id=user_id,
+            )
+            for _ in range(min(chunk_size, count - start))
+        ])
+    session.commit()
+    session.close()
+
+
+def legacy_add_article(cmd, uow):
+    with uow:
+        user = uow.users.get(cmd.user_id)
+        user.add_article(Article(cmd.title, cmd.description, cmd.content))
+        uow.commit()
+
+
+def run(sizes, repeat):
+    print(f"{'existing':>10} {'append p50 ms':>14} {'legacy p50 ms':>14}")
+    for size in sizes:
+        with bench_session_factory() as session_factory:
+            uow = BlogUnitOfWork(session_factory)
+            user_id = create_user(commands.CreateUser("Jon", "Snow"), uow)
+            seed_articles(session_factory, user_id, size)
+            cmd = commands.AddArticle("title", "description", "content", user_id)
+
+            append = timed(lambda: add_article(cmd, uow), repeat)
+            legacy = timed(lambda: legacy_add_article(cmd, uow), repeat)
+            print(
+                f"{size:>10} {percentile(append, 50) * 1000:>14.3f} "
+                f"{percentile(legacy, 50) * 1000:>14.3f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Insert throughput of uuid1 text ids against uuid7 binary ids.
+
+    python -m benchmarks.bench_article_ids --rows 200000
+
+Inserts the same rows, one chunk per transaction, into a copy of the
+articles table keyed by ``str(uuid1())`` (the previous scheme) and into the
+current BinaryUUID-keyed table, and reports rows/s for each.
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import MetaData, Table, Column, String, Index, create_engine
+
+from blog.adapters.orm import BinaryUUID, articles
+from blog.domain.models import ArticleStatus, get_new_uuid
+from benchmarks.common import local_postgres_uri
+
+
+def article_table(name, id_type):
+    metadata = MetaData()
+    table = Table(
+        name,
+        metadata,
+        Column('id', id_type, primary_key=True),
+        *[
+            Column(column.name, column.type)
+            for column in articles.columns if column.name != 'id'
+        ],
+    )
+    Index(f'ix_{name}_created_at_id', table.c.created_at, table.c.id)
+    Index(f'ix_{name}_user_id_created_at_id', table.c.user_id, table.c.created_at, table.c.id)
+    return metadata, table
+
+def insert(engine, table, new_id, rows, chunk_size):
+    start = datetime(2022, 1, 1)
+    elapsed = 0.0
+    for offset in range(0, rows, chunk_size):
+        chunk = [
+            dict(
+                id=new_id(),
+                title=f"title {i}",
+                description="description",
+                content="content",
+                status=ArticleStatus.DRAFT,
+                user_id=1,
+                created_at=start + timedelta(seconds=i),
+                updated_at=start + timedelta(seconds=i),
+            )
+            for i in range(offset, min(offset + chunk_size, rows))
+        ]
+        began = time.perf_counter()
+        with engine.begin() as connection:
+            connection.execute(table.insert(), chunk)
+        elapsed += time.perf_counter() - began
+    return rows / elapsed
+
+
+def run(uri, rows, chunk_size):
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(uri or f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        results = {}
+        for name, metadata, table, new_id in (
+            ("uuid1_text", *article_table('legacy_articles', String), lambda: str(uuid.uuid1())),
+            ("uuid7_binary", *article_table('binary_articles', BinaryUUID), get_new_uuid),
+        ):
+            metadata.drop_all(engine)
+            metadata.create_all(engine)
+            try:
+                results[name] = insert(engine, table, new_id, rows, chunk_size)
+            finally:
+                metadata.drop_all(engine)
+        engine.dispose()
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    uri = None
+    if args.database == "postgres":
+        uri = local_postgres_uri()
+        if uri is None:
+            parser.error("no local Postgres benchmark database is reachable")
+
+    for name, rate in run(uri, args.rows, args.chunk_size).items():
+        print(f"{name:<14} {rate:>12.1f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
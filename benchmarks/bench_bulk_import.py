@@ -0,0 +1,53 @@
+"""Rows per second: one add_article per row against the bulk importer.
+
+    python -m benchmarks.bench_bulk_import --rows 50000
+"""
+import argparse
+import time
+
+from blog.domain import commands
+from blog.services.bulk_import import import_records
+from blog.services.handlers import add_article, create_user
+from blog.services.unit_of_work import BlogUnitOfWork
+from benchmarks.common import bench_session_factory
+
+
+def records(user_id, rows):
+    for i in range(rows):
+        yield {
+            "type": "article",
+            "title": f"title {i}",
+            "description": "description",
+            "content": "content " * 50,
+            "user_id": user_id,
+        }
+
+
+def per_row(uow, user_id, rows):
+    start = time.perf_counter()
+    for record in records(user_id, rows):
+        record.pop("type")
+        add_article(commands.AddArticle(**record), uow)
+    return rows / (time.perf_counter() - start)
+
+
+def bulk(uow, user_id, rows, chunk_size):
+    result = import_records(records(user_id, rows), uow, "bench", chunk_size=chunk_size)
+    return result.rows_per_second
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--per-row-rows", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    with bench_session_factory() as session_factory:
+        uow = BlogUnitOfWork(session_factory)
+        user_id = create_user(commands.CreateUser("Jon", "Snow"), uow)
+        print(f"add_article per row {per_row(uow, user_id, args.per_row_rows):>10.1f} rows/s")
+        print(f"bulk import         {bulk(uow, user_id, args.rows, args.chunk_size):>10.1f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
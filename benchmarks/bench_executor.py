@@ -0,0 +1,83 @@
+"""Command throughput of CommandExecutor as the worker count grows.
+
+    python -m benchmarks.bench_executor --workers 1 2 4 8 --users 16
+
+Each run publishes then archives every article of ``--users`` users, so
+lanes only ever contend on the database. SQLite serializes writers, so
+the sweep is only meaningful with ``--database postgres``.
+"""
+import argparse
+import time
+
+from blog.domain import commands
+from blog.services.bulk_import import import_records
+from blog.services.executor import CommandExecutor
+from blog.services.handlers import create_user
+from blog.services.unit_of_work import BlogUnitOfWork
+from benchmarks.common import bench_session_factory, local_postgres_uri
+
+
+def seed(uow, users, articles):
+    user_ids = [
+        create_user(commands.CreateUser("Jon", f"Snow {i}"), uow)
+        for i in range(users)
+    ]
+    import_records(
+        (
+            {
+                "type": "article", "title": "title", "description": "description",
+                "content": "content", "user_id": user_id,
+            }
+            for user_id in user_ids for _ in range(articles)
+        ),
+        uow,
+        "bench",
+    )
+    with uow:
+        return [
+            commands.PublishArticle(article.id, article.user_id)
+            for article in uow.articles.get_all()
+        ]
+
+
+def run(uri, workers, users, articles):
+    with bench_session_factory(uri) as session_factory:
+        uow = BlogUnitOfWork(session_factory)
+        publishes = seed(uow, users, articles)
+        cmds = [
+            command
+            for publish in publishes
+            for command in (
+                publish, commands.ArchiveArticle(publish.article_id, publish.user_id),
+            )
+        ]
+        with CommandExecutor(uow, workers=workers) as executor:
+            start = time.perf_counter()
+            outcomes = executor.execute(cmds)
+            elapsed = time.perf_counter() - start
+    failed = sum(not outcome.ok for outcome in outcomes)
+    return len(cmds) / elapsed, failed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--articles", type=int, default=50)
+    args = parser.parse_args()
+
+    uri = None
+    if args.database == "postgres":
+        uri = local_postgres_uri()
+        if uri is None:
+            parser.error("no local Postgres benchmark database is reachable")
+
+    print(f"{'workers':>8} {'commands/s':>12} {'failed':>7}")
+    for workers in args.workers:
+        rate, failed = run(uri, workers, args.users, args.articles)
+        print(f"{workers:>8} {rate:>12.1f} {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Peak memory of the streaming export at growing table sizes.
+
+    python -m benchmarks.bench_export --rows 10000 100000 1000000
+
+Seeds each size into a fresh database and exports it to /dev/null; the
+traced peak should stay flat as the row count grows.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from blog.services.export import export_articles
+from blog.services.unit_of_work import BlogUnitOfWork
+from benchmarks.bench_memory import seed
+from benchmarks.common import bench_session_factory
+
+
+def run(rows, format, chunk_size):
+    with bench_session_factory() as session_factory:
+        seed(session_factory, rows)
+        uow = BlogUnitOfWork(session_factory)
+        with open(os.devnull, "w") as out:
+            tracemalloc.start()
+            start = time.perf_counter()
+            export_articles(out, uow, format=format, chunk_size=chunk_size)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(f"{'rows':>10} {'peak KiB':>10} {'rows/s':>10}")
+    for rows in args.rows:
+        peak, elapsed = run(rows, args.format, args.chunk_size)
+        print(f"{rows:>10} {peak / 1024:>10.1f} {rows / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
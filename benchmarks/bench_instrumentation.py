@@ -0,0 +1,45 @@
+"""Overhead of leaving unit-of-work instrumentation switched on.
+
+    python -m benchmarks.bench_instrumentation --repeat 500
+"""
+import argparse
+
+from blog.adapters.instrumentation import Instrumentation
+from blog.domain import commands
+from blog.services.message_bus import bootstrap
+from blog.services.unit_of_work import BlogUnitOfWork
+from benchmarks.common import bench_session_factory, timed, percentile
+
+
+def run(repeat):
+    with bench_session_factory() as session_factory:
+        plain = bootstrap(BlogUnitOfWork(session_factory))
+        instrumented = bootstrap(
+            BlogUnitOfWork(session_factory, instrumentation=Instrumentation())
+        )
+        user_id = plain.handle(commands.CreateUser("Jon", "Snow"))
+        cmd = commands.AddArticle("title", "description", "content", user_id)
+
+        # interleave so both runs see the same database growth
+        baseline, measured = [], []
+        for _ in range(repeat):
+            baseline += timed(lambda: plain.handle(cmd), 1)
+            measured += timed(lambda: instrumented.handle(cmd), 1)
+        baseline.sort()
+        measured.sort()
+
+    off, on = percentile(baseline, 50) * 1000, percentile(measured, 50) * 1000
+    print(f"AddArticle p50 without instrumentation {off:8.3f} ms")
+    print(f"AddArticle p50 with instrumentation    {on:8.3f} ms")
+    print(f"overhead                               {(on - off) / off:8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Bytes per article held in memory, per representation.
+
+    python -m benchmarks.bench_memory --rows 1000000
+
+Loads the same rows as mapped Article instances (content deferred), plain
+row dicts and content-free ArticleSummary tuples, and reports traced bytes
+per article.
+"""
+import argparse
+import gc
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from blog.adapters.orm import articles
+from blog.domain.models import (
+    Article,
+    ArticleStatus,
+    ArticleSummary,
+    get_new_uuid,
+)
+from benchmarks.common import bench_session_factory
+
+
+def seed(session_factory, rows, chunk_size=10000):
+    session = session_factory()
+    start = datetime(2022, 1, 1)
+    for offset in range(0, rows, chunk_size):
+        session.execute(articles.insert(), [
+            dict(
+                id=get_new_uuid(),
+                title=f"title {i}",
+                description="description",
+                content="content",
+                status=ArticleStatus.ALL[i % 4],
+                user_id=1,
+                created_at=start + timedelta(seconds=i),
+                updated_at=start + timedelta(seconds=i),
+            )
+            for i in range(offset, min(offset + chunk_size, rows))
+        ])
+    session.commit()
+    session.close()
+
+
+def measure(load):
+    gc.collect()
+    tracemalloc.start()
+    objects = load()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(objects), objects
+
+
+def run(rows):
+    with bench_session_factory() as session_factory:
+        seed(session_factory, rows)
+        session = session_factory()
+        columns = [articles.c[name] for name in (
+            "id", "title", "description", "content", "status",
+            "user_id", "created_at", "updated_at",
+        )]
+
+        orm, loaded = measure(lambda: session.query(Article).all())
+        del loaded
+        session.expunge_all()
+
+        mappings, loaded = measure(
+            lambda: [dict(row) for row in session.execute(select(*columns)).mappings()]
+        )
+        del loaded
+
+        summaries, loaded = measure(lambda: [
+            ArticleSummary(*row) for row in session.execute(
+                select(*(articles.c[name] for name in ArticleSummary._fields))
+            )
+        ])
+        del loaded
+        session.close()
+
+    print(f"rows: {rows}")
+    print(f"mapped Article   {orm:10.1f} bytes/article")
+    print(f"row dict         {mappings:10.1f} bytes/article")
+    print(f"ArticleSummary   {summaries:10.1f} bytes/article")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+    run(args.rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Per-message dispatch overhead of the MessageBus over a direct call.
+
+    python -m benchmarks.bench_message_bus --messages 100000
+"""
+import argparse
+import time
+
+from blog.domain import commands, events
+from blog.services.message_bus import MessageBus
+
+
+class NullUnitOfWork:
+
+    def __init__(self):
+        self.new_events = []
+
+    def collect_new_events(self):
+        while self.new_events:
+            yield self.new_events.pop(0)
+
+
+def noop(message, uow):
+    return None
+
+
+def raise_event(cmd, uow):
+    uow.new_events.append(events.ArticlePublished(cmd.article_id, cmd.user_id))
+
+
+def measure(fn, messages):
+    start = time.perf_counter()
+    for _ in range(messages):
+        fn()
+    return (time.perf_counter() - start) / messages * 1e6
+
+
+def run(messages):
+    uow = NullUnitOfWork()
+    cmd = commands.PublishArticle("article-id", 1)
+
+    bus = MessageBus(uow=uow)
+    bus.subscribe(commands.PublishArticle, noop)
+    direct = measure(lambda: noop(cmd, uow), messages)
+    dispatched = measure(lambda: bus.handle(cmd), messages)
+
+    with_event = MessageBus(uow=uow)
+    with_event.subscribe(commands.PublishArticle, raise_event)
+    with_event.subscribe(events.ArticlePublished, noop)
+    followed = measure(lambda: with_event.handle(cmd), messages)
+
+    print(f"direct call          {direct:8.3f} us/message")
+    print(f"bus command          {dispatched:8.3f} us/message")
+    print(f"bus command + event  {followed:8.3f} us/message")
+    print(f"dispatch overhead    {dispatched - direct:8.3f} us/message")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100000)
+    args = parser.parse_args()
+    run(args.messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Per-call CPU time of repository lookups, legacy Query API against select().
+
+    python -m benchmarks.bench_repository --calls 5000
+
+``legacy`` rebuilds ``session.query(model)`` and uses ``Query.get`` and a
+query-wrapped EXISTS, as the repository did before; ``current`` is
+``SqlAlchemyRepository``. A "miss" expunges the session first so the row is
+loaded from the database; a "hit" is served by the identity map.
+"""
+import argparse
+import time
+
+from sqlalchemy import exists, select
+
+from blog.adapters.orm import articles
+from blog.adapters.repositories import SqlAlchemyRepository
+from blog.domain.models import Article
+from benchmarks.bench_add_article import seed_articles
+from benchmarks.common import bench_session_factory
+
+
+def legacy_get(session, article_id):
+    return session.query(Article).get(article_id)
+
+
+def legacy_exists(session, article_id):
+    return session.query(exists().where(Article.id == article_id)).scalar()
+
+
+def cpu_per_call(fn, ids, before=None):
+    elapsed = 0.0
+    for article_id in ids:
+        if before is not None:
+            before()
+        start = time.process_time()
+        fn(article_id)
+        elapsed += time.process_time() - start
+    return elapsed / len(ids)
+
+
+def run(calls, rows):
+    with bench_session_factory() as session_factory:
+        session = session_factory()
+        session.execute("INSERT INTO users (first_name, last_name) VALUES ('Jon', 'Snow')")
+        session.commit()
+        seed_articles(session_factory, 1, rows)
+        ids = session.execute(select(articles.c.id)).scalars().all()
+        ids = [ids[i % len(ids)] for i in range(calls)]
+        repository = SqlAlchemyRepository(Article, session)
+
+        cases = {
+            "get miss": (
+                lambda i: legacy_get(session, i), repository.get, session.expunge_all
+            ),
+            "get hit": (lambda i: legacy_get(session, i), repository.get, None),
+            "exists": (lambda i: legacy_exists(session, i), repository.exists, None),
+        }
+        print(f"{'case':>10} {'legacy us':>10} {'current us':>11} {'speedup':>8}")
+        for name, (legacy, current, before) in cases.items():
+            # warm the compiled caches, and the identity map for hits
+            cpu_per_call(legacy, ids, before)
+            cpu_per_call(current, ids, before)
+            old = cpu_per_call(legacy, ids, before)
+            new = cpu_per_call(current, ids, before)
+            print(f"{name:>10} {old * 1e6:>10.1f} {new * 1e6:>11.1f} {old / new:>7.2f}x")
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.calls, args.rows)
+
+
+if __name__ == "__main__":
+    main()
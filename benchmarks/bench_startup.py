@@ -0,0 +1,85 @@
+"""Cold-start profile: import time and first-command latency.
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --baseline benchmarks/startup_baseline.json
+
+Every run is a fresh interpreter pointed at a new SQLite file through
+DATABASE_URI, so the numbers include engine creation and mapper setup.
+Exits non-zero when a median regresses past --tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+from blog.services.message_bus import bootstrap
+from blog.domain import commands
+imported = time.perf_counter()
+bus = bootstrap()
+user_id = bus.handle(commands.CreateUser("Jon", "Snow"))
+first = time.perf_counter()
+bus.handle(commands.AddArticle("title", "description", "content", user_id))
+second = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_command_ms": (first - imported) * 1000,
+    "warm_command_ms": (second - first) * 1000,
+}))
+"""
+
+
+def probe(directory, run):
+    env = dict(os.environ, DATABASE_URI=f"sqlite:///{directory}/startup-{run}.db")
+    subprocess.run(
+        [sys.executable, "-m", "blog.adapters.schema"], env=env, check=True
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        samples = [probe(directory, run) for run in range(args.runs)]
+    report = {
+        metric: statistics.median(sample[metric] for sample in samples)
+        for metric in samples[0]
+    }
+    for metric, value in report.items():
+        print(f"{metric:<18} {value:8.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for metric, value in report.items():
+            if metric in baseline and value > baseline[metric] * (1 + args.tolerance):
+                print(
+                    f"REGRESSION {metric}: {value:.2f} ms vs {baseline[metric]:.2f} ms",
+                    file=sys.stderr,
+                )
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
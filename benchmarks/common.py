@@ -0,0 +1,60 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker, clear_mappers
+
+from blog.adapters.orm import start_mappers, metadata
+from blog.config import get_database_uri
+
+
+def local_postgres_uri():
+    # a dedicated database, so the suite never drops tables holding real data
+    uri = os.environ.get("BENCH_DATABASE_URI") or (
+        get_database_uri().rsplit("/", 1)[0] + "/blog_bench"
+    )
+    # DATABASE_URI may point at SQLite, which has nothing to probe
+    if make_url(uri).get_backend_name() != "postgresql":
+        return None
+    engine = create_engine(uri, connect_args={"connect_timeout": 2})
+    try:
+        engine.connect().close()
+    except DBAPIError:
+        return None
+    finally:
+        engine.dispose()
+    return uri
+
+
+@contextmanager
+def bench_session_factory(uri=None):
+    with tempfile.TemporaryDirectory() as directory:
+        uri = uri or f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        engine = create_engine(uri)
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        start_mappers()
+        try:
+            yield sessionmaker(bind=engine)
+        finally:
+            clear_mappers()
+            metadata.drop_all(engine)
+            engine.dispose()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
@@ -0,0 +1,235 @@
+"""Reproducible benchmark suite for the handlers, repositories and mapping.
+
+    python -m benchmarks.suite --sizes 1000 10000 --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+Runs on a throwaway SQLite file, or on Postgres when ``--database postgres``
+is given or ``--database auto`` finds the ``blog_bench`` database (override
+with BENCH_DATABASE_URI). Exits non-zero when a case's p50 regresses past
+``--tolerance`` relative to the baseline.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+from datetime import datetime, timedelta
+from itertools import cycle
+
+import sqlalchemy
+
+from blog.adapters.orm import articles, users
+from blog.domain import commands
+from blog.domain.models import ArticleStatus, get_new_uuid
+from blog.services.handlers import (
+    create_user,
+    add_article,
+    publish_article,
+    delete_article,
+    archive_article,
+    rebuild_article_stats,
+)
+from blog.services.unit_of_work import BlogUnitOfWork
+from benchmarks.common import (
+    bench_session_factory,
+    local_postgres_uri,
+    timed,
+    percentile,
+)
+
+ARTICLES_PER_USER = 100
+PAGE_SIZE = 50
+
+
+def seed(session_factory, size, repeat, chunk_size=5000):
+    session = session_factory()
+    user_count = size // ARTICLES_PER_USER + 1
+    session.execute(users.insert(), [
+        dict(first_name="Jon", last_name=f"Snow {i}") for i in range(user_count)
+    ])
+    user_ids = [row.id for row in session.execute(sqlalchemy.select(users.c.id))]
+
+    start = datetime(2022, 1, 1)
+    statuses = [ArticleStatus.DRAFT, ArticleStatus.PUBLISHED] * 2 + [
+        ArticleStatus.ARCHIVED, ArticleStatus.DELETED,
+    ]
+    rows, ids = [], []
+    for i in range(size):
+        article_id = get_new_uuid()
+        ids.append(article_id)
+        rows.append(dict(
+            id=article_id,
+            title=f"title {i}",
+            description="description",
+            content="content " * 50,
+            status=statuses[i % len(statuses)],
+            user_id=user_ids[i % len(user_ids)],
+            created_at=start + timedelta(seconds=i),
+            updated_at=start + timedelta(seconds=i),
+        ))
+        if len(rows) == chunk_size:
+            session.execute(articles.insert(), rows)
+            rows = []
+    if rows:
+        session.execute(articles.insert(), rows)
+    session.commit()
+    session.close()
+
+    uow = BlogUnitOfWork(session_factory)
+    rebuild_article_stats(commands.RebuildArticleStats(), uow)
+    owner = user_ids[0]
+    cmd = commands.AddArticle("title", "description", "content", owner)
+    pools = {
+        name: [add_article(cmd, uow) for _ in range(repeat)]
+        for name in ("publish", "delete", "archive")
+    }
+    for article_id in pools["archive"]:
+        publish_article(commands.PublishArticle(article_id, owner), uow)
+    return owner, ids, pools
+
+
+def deep_cursor(uow, owner, pages):
+    cursor = None
+    with uow:
+        for _ in range(pages):
+            page = uow.articles.list(limit=PAGE_SIZE, cursor=cursor, user_id=owner)
+            if not page.next_cursor:
+                break
+            cursor = page.next_cursor
+    return cursor
+
+
+def cases(session_factory, size, repeat):
+    uow = BlogUnitOfWork(session_factory)
+    owner, ids, pools = seed(session_factory, size, repeat)
+    publish_ids = iter(pools["publish"])
+    delete_ids = iter(pools["delete"])
+    archive_ids = iter(pools["archive"])
+    random_ids = cycle(random.Random(size).sample(ids, min(len(ids), repeat)) or [None])
+    cursor = deep_cursor(uow, owner, ARTICLES_PER_USER // PAGE_SIZE)
+
+    def get():
+        with uow:
+            uow.articles.get(next(random_ids))
+
+    def list_page(cursor):
+        def run():
+            with uow:
+                uow.articles.list(limit=PAGE_SIZE, cursor=cursor, user_id=owner)
+        return run
+
+    return {
+        "create_user": lambda: create_user(commands.CreateUser("Jon", "Snow"), uow),
+        "add_article": lambda: add_article(
+            commands.AddArticle("title", "description", "content", owner), uow
+        ),
+        "publish_article": lambda: publish_article(
+            commands.PublishArticle(next(publish_ids), owner), uow
+        ),
+        "delete_article": lambda: delete_article(
+            commands.DeleteArticle(next(delete_ids), owner), uow
+        ),
+        "archive_article": lambda: archive_article(
+            commands.ArchiveArticle(next(archive_ids), owner), uow
+        ),
+        "get": get,
+        "list_first_page": list_page(None),
+        "list_deep_page": list_page(cursor),
+    }
+
+
+def run(uri, sizes, repeat):
+    results = []
+    for size in sizes:
+        with bench_session_factory(uri) as session_factory:
+            for name, fn in cases(session_factory, size, repeat).items():
+                samples = timed(fn, repeat)
+                total = sum(samples)
+                results.append({
+                    "case": name,
+                    "size": size,
+                    "p50_ms": percentile(samples, 50) * 1000,
+                    "p95_ms": percentile(samples, 95) * 1000,
+                    "mean_ms": total / len(samples) * 1000,
+                    "ops_per_s": len(samples) / total,
+                })
+    return results
+
+
+def compare(results, baseline, tolerance):
+    expected = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        reference = expected.get((result["case"], result["size"]))
+        if not reference:
+            continue
+        ratio = result["p50_ms"] / reference["p50_ms"]
+        result["baseline_p50_ms"] = reference["p50_ms"]
+        result["ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def print_table(results):
+    print(f"{'case':<18} {'size':>8} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>10} {'vs base':>8}")
+    for r in results:
+        ratio = f"{r['ratio']:.2f}x" if "ratio" in r else "-"
+        print(
+            f"{r['case']:<18} {r['size']:>8} {r['p50_ms']:>9.3f} "
+            f"{r['p95_ms']:>9.3f} {r['ops_per_s']:>10.1f} {ratio:>8}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database", choices=("auto", "sqlite", "postgres"), default="auto")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--output")
+    parser.add_argument("--baseline")
+    parser.add_argument("--save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    uri = None
+    if args.database != "sqlite":
+        uri = local_postgres_uri()
+        if uri is None and args.database == "postgres":
+            parser.error("no local Postgres benchmark database is reachable")
+
+    report = {
+        "meta": {
+            "database": "postgresql" if uri else "sqlite",
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "repeat": args.repeat,
+        },
+        "results": run(uri, args.sizes, args.repeat),
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report["results"], json.load(f), args.tolerance)
+    print_table(report["results"])
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    for r in regressions:
+        print(
+            f"REGRESSION {r['case']} size={r['size']}: p50 {r['p50_ms']:.3f} ms "
+            f"vs {r['baseline_p50_ms']:.3f} ms",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
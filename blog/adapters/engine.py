@@ -0,0 +1,124 @@
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
+
+from blog.config import (
+    PoolSettings,
+    get_database_uri,
+    get_async_database_uri,
+    get_pool_settings,
+    get_replica_uris,
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+
+def create_engine_from_config(uri: str = None, settings: PoolSettings = None) -> Engine:
+    uri = uri or get_database_uri()
+    settings = settings or get_pool_settings()
+    if uri.startswith("sqlite"):
+        return create_engine(uri)
+    connect_args = {}
+    if settings.statement_timeout_ms is not None and uri.startswith("postgresql"):
+        connect_args["options"] = f"-c statement_timeout={settings.statement_timeout_ms}"
+    return create_engine(
+        uri,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.timeout,
+        pool_recycle=settings.recycle,
+        pool_pre_ping=settings.pre_ping,
+        connect_args=connect_args,
+    )
+
+
+def create_async_engine_from_config(
+    uri: str = None, settings: PoolSettings = None
+) -> AsyncEngine:
+    uri = uri or get_async_database_uri()
+    settings = settings or get_pool_settings()
+    if uri.startswith("sqlite"):
+        return create_async_engine(uri)
+    connect_args = {}
+    if settings.statement_timeout_ms is not None:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.statement_timeout_ms)
+        }
+    return create_async_engine(
+        uri,
+        pool_size=settings.size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.timeout,
+        pool_recycle=settings.recycle,
+        pool_pre_ping=settings.pre_ping,
+        connect_args=connect_args,
+    )
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine_from_config()
+    return _engine
+
+
+_replica_engines = None
+
+
+def get_replica_engines() -> list:
+    global _replica_engines
+    if _replica_engines is None:
+        with _engine_lock:
+            if _replica_engines is None:
+                _replica_engines = [
+                    create_engine_from_config(uri) for uri in get_replica_uris()
+                ]
+    return _replica_engines
+
+
+def pool_stats(engine: Engine = None) -> dict:
+    pool = (engine or get_engine()).pool
+    stats = {"status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            wait_seconds=pool.wait_seconds,
+            max_wait_seconds=pool.max_wait_seconds,
+        )
+    return stats
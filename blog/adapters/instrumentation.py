@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+DURATION_BUCKETS = tuple(0.00005 * 2 ** i for i in range(18))  # 50us .. ~6.5s
+COUNT_BUCKETS = tuple(2 ** i for i in range(13))  # 1 .. 4096
+
+current_command: ContextVar[Optional[str]] = ContextVar("current_command", default=None)
+_current_metrics: ContextVar[Optional["UnitOfWorkMetrics"]] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+@dataclass
+class UnitOfWorkMetrics:
+    command: str
+    started_at: float = field(default_factory=time.perf_counter)
+    phases: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    statements: int = 0
+    rows_fetched: int = 0
+    rows_written: int = 0
+    token: object = field(default=None, repr=False)
+
+
+class Histogram:
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip(
+                [str(bound) for bound in self.buckets] + ["+Inf"], self.counts
+            )),
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+        }
+
+
+class Instrumentation:
+    """Aggregates per unit-of-work timings and SQL counts by command type."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._engines = set()
+
+    def watch(self, engine: Engine):
+        if engine in self._engines:
+            return
+        from sqlalchemy import event
+        with self._lock:
+            if engine not in self._engines:
+                event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+                self._engines.add(engine)
+
+    def watch_session(self, session):
+        from sqlalchemy import event
+        event.listen(session, "before_flush", _before_flush)
+        event.listen(session, "after_flush_postexec", _after_flush)
+
+    def start(self) -> UnitOfWorkMetrics:
+        metrics = UnitOfWorkMetrics(current_command.get() or "unknown")
+        metrics.token = _current_metrics.set(metrics)
+        return metrics
+
+    def finish(self, metrics: UnitOfWorkMetrics):
+        _current_metrics.reset(metrics.token)
+        metrics.phases["total"] = time.perf_counter() - metrics.started_at
+        with self._lock:
+            for phase, seconds in metrics.phases.items():
+                self._observe(metrics.command, f"{phase}_seconds", seconds, DURATION_BUCKETS)
+            self._observe(metrics.command, "statements", metrics.statements, COUNT_BUCKETS)
+            self._observe(metrics.command, "rows_fetched", metrics.rows_fetched, COUNT_BUCKETS)
+            self._observe(metrics.command, "rows_written", metrics.rows_written, COUNT_BUCKETS)
+
+    @contextmanager
+    def phase(self, metrics: UnitOfWorkMetrics, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            metrics.phases[name] += time.perf_counter() - start
+
+    def _observe(self, command, metric, value, buckets):
+        histogram = self._histograms.get((command, metric))
+        if histogram is None:
+            histogram = self._histograms[command, metric] = Histogram(buckets)
+        histogram.observe(value)
+
+    def histogram(self, command: str, metric: str) -> Optional[Histogram]:
+        return self._histograms.get((command, metric))
+
+    def export(self) -> dict:
+        with self._lock:
+            exported = defaultdict(dict)
+            for (command, metric), histogram in sorted(self._histograms.items()):
+                exported[command][metric] = histogram.to_dict()
+            return dict(exported)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+@contextmanager
+def command_label(name: str):
+    token = current_command.set(name)
+    try:
+        yield
+    finally:
+        current_command.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics.statements += 1
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+    started = conn.info["query_started_at"].pop()
+    metrics.phases["sql"] += time.perf_counter() - started
+    if context.isinsert or context.isupdate or context.isdelete:
+        if cursor.rowcount > 0:
+            metrics.rows_written += cursor.rowcount
+    elif cursor.description is not None:
+        # the result is built from context.cursor after this hook, so every
+        # read, ORM or Core, fetches through the counting cursor
+        context.cursor = _CountingCursor(cursor, metrics)
+
+
+class _CountingCursor:
+    """Proxies a DBAPI cursor, adding the rows it returns to rows_fetched."""
+
+    def __init__(self, cursor, metrics: UnitOfWorkMetrics):
+        self._cursor = cursor
+        self._metrics = metrics
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._metrics.rows_fetched += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._metrics.rows_fetched += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._metrics.rows_fetched += len(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def _before_flush(session, flush_context, instances):
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        session.info["flush_started_at"] = time.perf_counter()
+
+
+def _after_flush(session, flush_context):
+    metrics = _current_metrics.get()
+    started = session.info.pop("flush_started_at", None)
+    if metrics is not None and started is not None:
+        metrics.phases["flush"] += time.perf_counter() - started
@@ -1,10 +1,60 @@
-from sqlalchemy import MetaData, Table, Column, Integer, String, Unicode, ForeignKey, DateTime
-from sqlalchemy.orm import mapper, relationship
+import threading
+from uuid import UUID
 
-from blog.domain.models import User, Article
+from sqlalchemy import MetaData, Table, Column, Integer, String, LargeBinary, ForeignKey, DateTime, Index, JSON
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import deferred, mapper, relationship
+
+from blog.domain.models import User, Article, ArticleStats, ArticleStatus
 
 metadata = MetaData()
 
+
+class Status(TypeDecorator):
+    """Hands back the shared ArticleStatus constants instead of a new str per row."""
+
+    impl = String
+    cache_ok = True
+    _canonical = {status: status for status in ArticleStatus.ALL}
+
+    def process_result_value(self, value, dialect):
+        return self._canonical.get(value, value)
+
+
+class _RawBytes(LargeBinary):
+    # hand rows back untouched so legacy text ids survive the result phase
+    def result_processor(self, dialect, coltype):
+        return None
+
+
+class BinaryUUID(TypeDecorator):
+    """uuid strings stored as native uuid on Postgres and 16 raw bytes elsewhere.
+
+    Rows still holding the legacy text ids load unchanged, so a table can be
+    read while migrate_article_ids converts it.
+    """
+
+    impl = _RawBytes(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return _RawBytes(16)
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == 'postgresql' or isinstance(value, bytes):
+            return value
+        return bytes.fromhex(value.replace('-', ''))
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            return str(UUID(bytes=value))
+        return value
+
+
 users = Table(
     'users',
     metadata,
@@ -16,19 +66,116 @@ users = Table(
 articles = Table(
     'articles',
     metadata,
-    Column('id', Unicode, primary_key=True),
+    Column('id', BinaryUUID, primary_key=True),
     Column('title', String, nullable=False),
     Column('description', String, nullable=False),
     Column('content', String, nullable=False),
-    Column('status', String, nullable=False),
+    Column('status', Status, nullable=False),
     Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
     Column('created_at', DateTime, nullable=String),
     Column('updated_at', DateTime, nullable=String),
+    # bumped by every write; the mapper checks it on flush
+    Column('version', Integer, nullable=False, server_default='1'),
+    # every listing orders by (created_at, id) after its equality filters
+    Index('ix_articles_created_at_id', 'created_at', 'id'),
+    Index('ix_articles_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    Index('ix_articles_status_created_at_id', 'status', 'created_at', 'id'),
+    Index(
+        'ix_articles_user_id_status_created_at_id',
+        'user_id', 'status', 'created_at', 'id',
+    ),
+    # incremental exports read everything changed since the last run
+    Index('ix_articles_updated_at', 'updated_at'),
+)
+
+# archived and deleted articles past the tiering threshold, moved out of the
+# hot table by the tiering job; read only by id and by the stats rebuild
+cold_articles = Table(
+    'cold_articles',
+    metadata,
+    Column('id', BinaryUUID, primary_key=True),
+    Column('title', String, nullable=False),
+    Column('description', String, nullable=False),
+    Column('content', String, nullable=False),
+    Column('status', Status, nullable=False),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+    Index('ix_cold_articles_user_id', 'user_id'),
 )
 
+article_stats = Table(
+    'article_stats',
+    metadata,
+    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True),
+    Column('draft', Integer, nullable=False, default=0),
+    Column('published', Integer, nullable=False, default=0),
+    Column('archived', Integer, nullable=False, default=0),
+    Column('deleted', Integer, nullable=False, default=0),
+)
+
+# inverted index for search: one posting per (term, article) with the
+# article status copied in so a filtered search never joins articles
+article_terms = Table(
+    'article_terms',
+    metadata,
+    Column('term', String, primary_key=True),
+    Column('article_id', BinaryUUID, ForeignKey('articles.id'), primary_key=True),
+    Column('status', Status, nullable=False),
+    Column('weight', Integer, nullable=False),
+    Index('ix_article_terms_article_id', 'article_id'),
+)
+
+# how far each named bulk import got, committed with the rows it covers
+import_checkpoints = Table(
+    'import_checkpoints',
+    metadata,
+    Column('name', String, primary_key=True),
+    Column('position', Integer, nullable=False),
+)
+
+# domain events written in the same transaction as the change that raised
+# them; the relay delivers rows where delivered_at is still null, in id order
+outbox = Table(
+    'outbox',
+    metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('event_type', String, nullable=False),
+    Column('payload', JSON, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('delivered_at', DateTime),
+    Index('ix_outbox_delivered_at_id', 'delivered_at', 'id'),
+)
+
+
+# units of work map lazily on first use, so worker threads can race here
+_mappers_lock = threading.Lock()
+
 
 def start_mappers():
-    articles_mappers = mapper(Article, articles)
+    if _mapped():
+        return
+    with _mappers_lock:
+        if not _mapped():
+            _map()
+
+
+def _mapped():
+    # ArticleStats is mapped last, so the others are complete once it is
+    return inspect(ArticleStats, raiseerr=False) is not None
+
+
+def _map():
+    articles_mappers = mapper(Article, articles, version_id_col=articles.c.version, properties={
+        # content can be hundreds of KB; load it only when it is read
+        'content': deferred(articles.c.content),
+    })
+    event.listen(Article, 'load', _init_events)
     users_mapper = mapper(User, users, properties={
         'articles': relationship(articles_mappers, collection_class=set)
     })
+    mapper(ArticleStats, article_stats)
+
+
+def _init_events(article, _):
+    article.events = []
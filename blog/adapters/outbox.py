@@ -0,0 +1,49 @@
+import json
+import queue
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import List, Protocol
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    event_type: str
+    payload: dict
+    created_at: datetime
+
+    def to_dict(self) -> dict:
+        message = asdict(self)
+        message["created_at"] = self.created_at.isoformat()
+        return message
+
+
+class Sink(Protocol):
+    def send(self, messages: List[OutboxMessage]):
+        ...
+
+
+class QueueSink:
+    """Hands messages to in-process consumers through a queue.Queue."""
+
+    def __init__(self, messages: queue.Queue = None):
+        self.messages = messages if messages is not None else queue.Queue()
+
+    def send(self, messages: List[OutboxMessage]):
+        for message in messages:
+            self.messages.put(message)
+
+
+class FileSink:
+    """Appends messages to a file as NDJSON, one batch per write."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, messages: List[OutboxMessage]):
+        lines = "".join(json.dumps(message.to_dict()) + "\n" for message in messages)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+            f.flush()
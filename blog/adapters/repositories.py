@@ -1,6 +1,55 @@
+import base64
+import json
+import math
 from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    DateTime,
+    bindparam,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, make_transient_to_detached, undefer
+from sqlalchemy.orm.attributes import instance_state, set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from blog.adapters.cache import EntityCache
+from blog.adapters.orm import (
+    article_stats,
+    article_terms,
+    articles,
+    cold_articles,
+    import_checkpoints,
+    outbox,
+)
+from blog.adapters.outbox import OutboxMessage
+from blog.adapters.search import document_terms, query_terms
+from blog.domain.models import User, Article, ArticleStats, ArticleStatus, ArticleSummary
+
+STATS_COLUMNS = ArticleStatus.ALL
+# only articles that can no longer change are moved to the cold table
+COLD_STATUSES = (ArticleStatus.ARCHIVED, ArticleStatus.DELETED)
+
+
+@dataclass
+class Page:
+    items: List
+    next_cursor: Optional[str] = None
 
 
 class AbstractRepository(ABC):
@@ -18,23 +67,708 @@ class AbstractRepository(ABC):
     def get_all(self):
         pass
 
+    @abstractmethod
+    def exists(self, entity_id) -> bool:
+        pass
+
+    @abstractmethod
+    def list(self, limit: int = 50, cursor: str = None, **filters) -> Page:
+        pass
+
 
 class SqlAlchemyRepository(AbstractRepository):
-    def __init__(self, model, session):
+    def __init__(self, model, session, order_by=('id',), cache: EntityCache = None):
         self.model = model
         self.session = session
-
-    @property
-    def query(self):
-        return self.session.query(self.model)
+        self.order_by = order_by
+        self.cache = cache
+        self.seen = []
+        self.written = set()
 
     def add(self, entity):
         self.session.add(entity)
+        self.seen.append(entity)
         return entity
 
     def get(self, entity_id):
-        return self.query.get(entity_id)
+        if self.cache is None:
+            entity = self.session.get(self.model, entity_id)
+        else:
+            entity = self._get_through_cache(entity_id)
+        if entity is not None:
+            self.seen.append(entity)
+        return entity
+
+    def _get_through_cache(self, entity_id):
+        key = identity_key(self.model, entity_id)
+        entity = self.session.identity_map.get(key)
+        if entity is not None:
+            return entity
+        values = self.cache.get(key)
+        if values is not None:
+            return self._attach(values)
+        entity = self.session.get(self.model, entity_id)
+        # a lagging replica's rows must not be served to later primary reads
+        replica = self.session.info.get('replica')
+        if entity is not None and entity_id not in self.written and replica is None:
+            # a bare tuple in mapper column order keeps cached entries small
+            self.cache.put(key, tuple(
+                getattr(entity, attribute.key)
+                for attribute in _eager_attributes(self.model)
+            ))
+        return entity
+
+    def _attach(self, values):
+        mapper = inspect(self.model)
+        entity = mapper.class_manager.new_instance()
+        # deferred columns stay unloaded and load on access like a fresh get
+        for attribute, value in zip(_eager_attributes(self.model), values):
+            set_committed_value(entity, attribute.key, value)
+        make_transient_to_detached(entity)
+        self.session.add(entity)
+        state = instance_state(entity)
+        state.manager.dispatch.load(state, None)
+        return entity
 
     def get_all(self):
-        return self.query
+        # a lazy query, so callers can still count, slice or page it in SQL
+        return self.session.query(self.model)
+
+    def exists(self, entity_id) -> bool:
+        return self.session.execute(
+            _exists_statement(inspect(self.model)), {"entity_id": entity_id}
+        ).scalar()
+
+    def get_values(self, entity_ids, *attributes):
+        columns = [getattr(self.model, name) for name in attributes]
+        return self.session.execute(
+            select(*columns).where(self.model.id.in_(entity_ids))
+        ).all()
+
+    def add_many(self, rows):
+        if rows:
+            self.session.execute(insert(self.model), rows)
+
+    def list(self, limit: int = 50, cursor: str = None, **filters) -> Page:
+        items = self.session.execute(
+            self.list_statement(limit + 1, cursor, **filters)
+        ).scalars().all()
+        if len(items) <= limit:
+            return Page(items)
+        items = items[:limit]
+        return Page(items, self._encode_cursor(items[-1]))
+
+    def list_statement(self, limit: int, cursor: str = None, columns=None, **filters):
+        order_by = [getattr(self.model, name) for name in self.order_by]
+        statement = select(*(columns or [self.model])).where(*(
+            getattr(self.model, name) == value
+            for name, value in filters.items()
+            if value is not None
+        ))
+        if cursor:
+            statement = statement.where(
+                _keyset_after(order_by, self._decode_cursor(cursor))
+            )
+        return statement.order_by(*order_by).limit(limit)
+
+    def _encode_cursor(self, entity) -> str:
+        values = [getattr(entity, name) for name in self.order_by]
+        payload = json.dumps([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> List:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except ValueError:
+            raise ValueError(f"Invalid cursor {cursor!r}")
+        if not isinstance(values, list) or len(values) != len(self.order_by):
+            raise ValueError(f"Invalid cursor {cursor!r}")
+        columns = inspect(self.model).columns
+        return [
+            datetime.fromisoformat(value)
+            if isinstance(columns[name].type, DateTime) else value
+            for name, value in zip(self.order_by, values)
+        ]
+
+    def update_many(self, entity_ids, **values):
+        if entity_ids:
+            self.written.update(entity_ids)
+            self.session.execute(
+                update(self.model)
+                .where(self.model.id.in_(entity_ids))
+                .values(**values, **_version_bump(self.model))
+                .execution_options(synchronize_session=False)
+            )
+
+
+class ArticleRepository(SqlAlchemyRepository):
+    def __init__(self, session, order_by=('id',), cache: EntityCache = None):
+        super().__init__(Article, session, order_by=order_by, cache=cache)
+        self.events = []
+
+    def get(self, article_id):
+        if not _is_article_id(article_id):
+            return None
+        article = super().get(article_id)
+        if article is None:
+            article = self.get_cold(article_id)
+        return article
+
+    def exists(self, article_id) -> bool:
+        return _is_article_id(article_id) and super().exists(article_id)
+
+    def get_cold(self, article_id) -> Optional[Article]:
+        """An article moved to the cold table, detached from the session."""
+        if not _is_article_id(article_id):
+            return None
+        return _cold_article(self.session.execute(_cold_statement(article_id)).first())
+
+    def get_values(self, article_ids, *attributes):
+        article_ids = _article_ids(article_ids)
+        if not article_ids:
+            return []
+        rows = super().get_values(article_ids, *attributes)
+        if len(rows) < len(article_ids):
+            rows += self.session.execute(
+                select(*(cold_articles.c[name] for name in attributes))
+                .where(cold_articles.c.id.in_(article_ids))
+            ).all()
+        return rows
+
+    def move_to_cold(self, updated_before: datetime, limit: int) -> List[str]:
+        """Move up to limit archived or deleted articles into the cold table.
+
+        Their search postings are dropped and listings stop returning them;
+        get and stream still read them. Rows another mover has locked are
+        skipped; returns the ids moved.
+        """
+        article_ids = self.session.execute(
+            select(articles.c.id)
+            .where(
+                articles.c.status.in_(COLD_STATUSES),
+                articles.c.updated_at < updated_before,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not article_ids:
+            return []
+        self.written.update(article_ids)
+        names = [column.name for column in cold_articles.columns]
+        self.session.execute(insert(cold_articles).from_select(
+            names,
+            select(*(articles.c[name] for name in names))
+            .where(articles.c.id.in_(article_ids)),
+        ))
+        self.session.execute(_remove_statement(article_ids))
+        self.session.execute(delete(articles).where(articles.c.id.in_(article_ids)))
+        return article_ids
+
+    def get_summary(self, article_id) -> Optional[ArticleSummary]:
+        if not _is_article_id(article_id):
+            return None
+        row = self.session.execute(
+            select(*_summary_columns()).where(Article.id == article_id)
+        ).first()
+        return ArticleSummary(*row) if row else None
+
+    def list_summaries(self, limit: int = 50, cursor: str = None, **filters) -> Page:
+        """Like list, over the hot table only; cold articles are not listed."""
+        rows = self.session.execute(self.list_statement(
+            limit + 1, cursor, columns=_summary_columns(), **filters
+        )).all()
+        items = [ArticleSummary(*row) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return Page(items)
+        return Page(items, self._encode_cursor(items[-1]))
+
+    def stream(
+        self,
+        columns,
+        chunk_size: int = 1000,
+        user_id: int = None,
+        status: str = None,
+        updated_since: datetime = None,
+    ):
+        """Yield chunks of plain rows from a server-side cursor.
+
+        Rows never become entities, so the identity map stays empty however
+        many articles are read. Articles moved to the cold table are
+        included, so exports keep the full history.
+        """
+        statements = [
+            _stream_statement(table, columns, user_id, status, updated_since)
+            for table in (articles, cold_articles)
+            if table is articles or status is None or status in COLD_STATUSES
+        ]
+        statement = statements[0] if len(statements) == 1 else union_all(*statements)
+        result = self.session.execute(statement, execution_options={
+            "stream_results": True,
+            "max_row_buffer": chunk_size,
+        })
+        yield from result.partitions(chunk_size)
+
+    def transition(self, article_ids, user_id, from_status, to_status) -> int:
+        """Move the user's articles that are still in from_status, in one UPDATE.
+
+        Returns how many rows matched the guard; nothing is loaded.
+        """
+        article_ids = _article_ids(article_ids)
+        if not article_ids:
+            return 0
+        self.written.update(article_ids)
+        return self.session.execute(
+            update(Article)
+            .where(
+                Article.id.in_(article_ids),
+                Article.user_id == user_id,
+                Article.status == from_status,
+            )
+            .values(
+                status=to_status,
+                updated_at=datetime.utcnow(),
+                **_version_bump(Article),
+            )
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+
+class ArticleStatsRepository(SqlAlchemyRepository):
+    def __init__(self, session, cache: EntityCache = None):
+        super().__init__(ArticleStats, session, order_by=('user_id',), cache=cache)
+
+    def increment(self, user_id, **deltas):
+        self.session.execute(
+            _increment_statement(self.session.get_bind().dialect, user_id, deltas)
+        )
+        self.written.add(user_id)
+
+    def move(self, user_id, from_status, to_status):
+        self.increment(user_id, **{from_status: -1, to_status: 1})
+
+    def rebuild(self):
+        self.session.execute(delete(ArticleStats))
+        self.session.execute(_rebuild_statement())
+        # every user gets a row, so commit evicts every cached stats entry
+        # and nothing else
+        self.written.update(
+            self.session.execute(select(article_stats.c.user_id)).scalars()
+        )
+
+
+class OutboxRepository:
+    def __init__(self, session):
+        self.session = session
+
+    def add_many(self, events):
+        rows = _outbox_rows(events)
+        if rows:
+            self.session.execute(insert(outbox), rows)
+
+    def pending(self, limit: int = 100) -> List[OutboxMessage]:
+        # SKIP LOCKED lets several relays share the table on Postgres
+        rows = self.session.execute(
+            select(
+                outbox.c.id, outbox.c.event_type,
+                outbox.c.payload, outbox.c.created_at,
+            )
+            .where(outbox.c.delivered_at.is_(None))
+            .order_by(outbox.c.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+        return [OutboxMessage(*row) for row in rows]
+
+    def mark_delivered(self, message_ids, delivered_at: datetime):
+        if message_ids:
+            self.session.execute(
+                update(outbox)
+                .where(outbox.c.id.in_(message_ids))
+                .values(delivered_at=delivered_at)
+            )
+
+
+def _outbox_rows(events):
+    now = datetime.utcnow()
+    return [
+        dict(event_type=type(event).__name__, payload=asdict(event), created_at=now)
+        for event in events
+    ]
+
+
+class CheckpointRepository:
+    def __init__(self, session):
+        self.session = session
+
+    def get(self, name: str) -> int:
+        position = self.session.execute(
+            select(import_checkpoints.c.position)
+            .where(import_checkpoints.c.name == name)
+        ).scalar()
+        return position or 0
+
+    def save(self, name: str, position: int):
+        updated = self.session.execute(
+            update(import_checkpoints)
+            .where(import_checkpoints.c.name == name)
+            .values(position=position)
+        ).rowcount
+        if not updated:
+            self.session.execute(
+                insert(import_checkpoints).values(name=name, position=position)
+            )
+
+
+class SearchRepository:
+    def __init__(self, session):
+        self.session = session
+
+    def index(self, article):
+        self.index_many([_search_row(article)])
+
+    def index_many(self, rows):
+        rows = list(rows)
+        if rows:
+            self.remove([row["id"] for row in rows])
+            self._insert_postings(rows)
+
+    def add_many(self, rows):
+        # for articles that are new in this transaction, so nothing to replace
+        self._insert_postings(list(rows))
+
+    def set_status(self, article_ids, status):
+        if article_ids:
+            self.session.execute(_set_status_statement(article_ids, status))
+
+    def remove(self, article_ids):
+        if article_ids:
+            self.session.execute(_remove_statement(article_ids))
+
+    def search(self, query: str, status: str = None, limit: int = 20) -> List[str]:
+        terms = query_terms(query)
+        if not terms:
+            return []
+        frequencies = self.session.execute(_frequencies_statement(terms)).all()
+        if not frequencies:
+            return []
+        return self.session.execute(
+            _search_statement(frequencies, status, limit)
+        ).scalars().all()
+
+    def rebuild(self, batch_size: int = 1000):
+        self.session.execute(delete(article_terms))
+        statement = (
+            select(
+                Article.id, Article.title, Article.description,
+                Article.content, Article.status,
+            )
+            .where(Article.status != ArticleStatus.DELETED)
+            .order_by(Article.id)
+            .limit(batch_size)
+        )
+        last_id = None
+        while True:
+            page = statement if last_id is None else statement.where(Article.id > last_id)
+            rows = self.session.execute(page).mappings().all()
+            if not rows:
+                return
+            self._insert_postings(rows)
+            last_id = rows[-1]["id"]
+
+    def _insert_postings(self, rows):
+        postings = _postings(rows)
+        if postings:
+            self.session.execute(insert(article_terms), postings)
+
+
+def _search_row(article):
+    return dict(
+        id=article.id,
+        title=article.title,
+        description=article.description,
+        content=article.content,
+        status=article.status,
+    )
+
+
+def _postings(rows):
+    return [
+        dict(term=term, article_id=row["id"], status=row["status"], weight=weight)
+        for row in rows
+        for term, weight in document_terms(
+            title=row["title"],
+            description=row["description"],
+            content=row["content"],
+        ).items()
+    ]
+
+
+def _set_status_statement(article_ids, status):
+    return (
+        update(article_terms)
+        .where(article_terms.c.article_id.in_(article_ids))
+        .values(status=status)
+    )
+
+
+def _remove_statement(article_ids):
+    return delete(article_terms).where(article_terms.c.article_id.in_(article_ids))
+
+
+def _frequencies_statement(terms):
+    return (
+        select(article_terms.c.term, func.count())
+        .where(article_terms.c.term.in_(terms))
+        .group_by(article_terms.c.term)
+    )
+
+
+def _search_statement(frequencies, status, limit):
+    # articles matching more of the query terms rank first, then by weight
+    # scaled down for common terms; the document frequencies come straight
+    # off the (term, article_id) primary key
+    idf = {term: 1 / (1 + math.log(count)) for term, count in frequencies}
+    score = func.sum(article_terms.c.weight * case(idf, value=article_terms.c.term))
+    statement = select(article_terms.c.article_id).where(
+        article_terms.c.term.in_(list(idf))
+    )
+    if status is not None:
+        statement = statement.where(article_terms.c.status == status)
+    return (
+        statement
+        .group_by(article_terms.c.article_id)
+        .order_by(func.count().desc(), score.desc(), article_terms.c.article_id)
+        .limit(limit)
+    )
+
+
+# an upsert, so two transactions creating a user's row at once cannot
+# both insert it
+UPSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _increment_statement(dialect, user_id, deltas):
+    statement = UPSERTS[dialect.name](article_stats).values(user_id=user_id, **deltas)
+    return statement.on_conflict_do_update(
+        index_elements=[article_stats.c.user_id],
+        set_={
+            status: article_stats.c[status] + delta
+            for status, delta in deltas.items()
+        },
+    )
+
+
+def _rebuild_statement():
+    tiers = union_all(
+        select(articles.c.user_id, articles.c.status),
+        select(cold_articles.c.user_id, cold_articles.c.status),
+    ).subquery()
+    counts = (
+        select(User.id, *(
+            func.sum(case((tiers.c.status == status, 1), else_=0))
+            for status in STATS_COLUMNS
+        ))
+        .outerjoin(tiers, tiers.c.user_id == User.id)
+        .group_by(User.id)
+    )
+    return insert(ArticleStats).from_select(('user_id', *STATS_COLUMNS), counts)
+
+
+# built once per mapper and bound per call, so each call skips statement
+# construction and reuses the compiled form from the engine's cache
+@lru_cache(maxsize=None)
+def _exists_statement(mapper):
+    return select(exists().where(mapper.columns["id"] == bindparam("entity_id")))
+
+
+def _eager_attributes(model):
+    return [
+        attribute for attribute in inspect(model).column_attrs
+        if not attribute.deferred
+    ]
+
+
+def _is_article_id(article_id) -> bool:
+    # ids come straight from request paths; a malformed one names no article
+    # instead of failing in the id column's bind processing
+    try:
+        UUID(str(article_id))
+    except ValueError:
+        return False
+    return True
+
+
+def _article_ids(article_ids) -> List:
+    return [article_id for article_id in article_ids if _is_article_id(article_id)]
+
+
+def _undeferred(model):
+    # an async session cannot lazy load, so deferred columns come up front
+    return [
+        undefer(attribute.key) for attribute in inspect(model).column_attrs
+        if attribute.deferred
+    ]
+
+
+def _cold_statement(article_id):
+    return select(cold_articles).where(cold_articles.c.id == article_id)
+
+
+def _cold_article(row) -> Optional[Article]:
+    if row is None:
+        return None
+    return Article(
+        row.title,
+        row.description,
+        row.content,
+        status=row.status,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        id=row.id,
+        user_id=row.user_id,
+    )
+
+
+def _stream_statement(table, columns, user_id, status, updated_since):
+    statement = select(*(table.c[name] for name in columns))
+    if user_id is not None:
+        statement = statement.where(table.c.user_id == user_id)
+    if status is not None:
+        statement = statement.where(table.c.status == status)
+    if updated_since is not None:
+        statement = statement.where(table.c.updated_at >= updated_since)
+    return statement
+
+
+def _summary_columns():
+    return [getattr(Article, name) for name in ArticleSummary._fields]
+
+
+def _version_bump(model):
+    # set-based writes bypass the mapper, so they bump the version themselves
+    column = inspect(model).version_id_col
+    if column is None:
+        return {}
+    return {column.key: column + 1}
+
+
+def _keyset_after(columns, values):
+    if len(columns) == 1:
+        return columns[0] > values[0]
+    # row-value comparison lets both SQLite and Postgres seek into the index;
+    # the values are bound with the column types so ids get converted too
+    return tuple_(*columns) > tuple_(*(
+        literal(value, type_=column.type) for column, value in zip(columns, values)
+    ))
+
+
+class AsyncSqlAlchemyRepository:
+    def __init__(self, model, session):
+        self.model = model
+        self.session = session
+        self.seen = []
+
+    def add(self, entity):
+        self.session.add(entity)
+        self.seen.append(entity)
+        return entity
+
+    async def get(self, entity_id):
+        entity = await self.session.get(
+            self.model, entity_id, options=_undeferred(self.model)
+        )
+        if entity is not None:
+            self.seen.append(entity)
+        return entity
+
+    async def get_all(self):
+        result = await self.session.execute(
+            select(self.model).options(*_undeferred(self.model))
+        )
+        return result.scalars().all()
+
+    async def exists(self, entity_id) -> bool:
+        result = await self.session.execute(
+            select(exists().where(self.model.id == entity_id))
+        )
+        return result.scalar()
+
+
+class AsyncArticleRepository(AsyncSqlAlchemyRepository):
+    def __init__(self, session):
+        super().__init__(Article, session)
+
+    async def get(self, article_id):
+        if not _is_article_id(article_id):
+            return None
+        article = await super().get(article_id)
+        if article is None:
+            article = await self.get_cold(article_id)
+        return article
+
+    async def get_cold(self, article_id) -> Optional[Article]:
+        if not _is_article_id(article_id):
+            return None
+        result = await self.session.execute(_cold_statement(article_id))
+        return _cold_article(result.first())
+
+    async def exists(self, article_id) -> bool:
+        return _is_article_id(article_id) and await super().exists(article_id)
+
+
+class AsyncArticleStatsRepository(AsyncSqlAlchemyRepository):
+    def __init__(self, session):
+        super().__init__(ArticleStats, session)
+
+    async def increment(self, user_id, **deltas):
+        dialect = self.session.sync_session.get_bind().dialect
+        await self.session.execute(_increment_statement(dialect, user_id, deltas))
+
+    async def move(self, user_id, from_status, to_status):
+        await self.increment(user_id, **{from_status: -1, to_status: 1})
+
+
+class AsyncOutboxRepository:
+    def __init__(self, session):
+        self.session = session
+
+    async def add_many(self, events):
+        rows = _outbox_rows(events)
+        if rows:
+            await self.session.execute(insert(outbox), rows)
+
+
+class AsyncSearchRepository:
+    def __init__(self, session):
+        self.session = session
+
+    async def index(self, article):
+        row = _search_row(article)
+        await self.remove([row["id"]])
+        postings = _postings([row])
+        if postings:
+            await self.session.execute(insert(article_terms), postings)
+
+    async def set_status(self, article_ids, status):
+        if article_ids:
+            await self.session.execute(_set_status_statement(article_ids, status))
+
+    async def remove(self, article_ids):
+        if article_ids:
+            await self.session.execute(_remove_statement(article_ids))
 
+    async def search(self, query: str, status: str = None, limit: int = 20) -> List[str]:
+        terms = query_terms(query)
+        if not terms:
+            return []
+        frequencies = (await self.session.execute(_frequencies_statement(terms))).all()
+        if not frequencies:
+            return []
+        result = await self.session.execute(_search_statement(frequencies, status, limit))
+        return result.scalars().all()
@@ -0,0 +1,66 @@
+import random
+import time
+from itertools import count
+from typing import Callable, Sequence
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import SelectBase
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to ``info["replica"]`` until the session writes.
+
+    Flushes, DML, locking reads and anything that is not a SELECT go to the
+    primary bind; compound selects such as UNION ALL count as reads. After
+    the first write every later read goes to the primary too, so a unit of
+    work always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        read = not self._flushing and _is_plain_read(clause)
+        if replica is not None and read and not self.info.get("wrote"):
+            return replica
+        if self._flushing or (clause is not None and not read):
+            self.info["wrote"] = True
+        return super().get_bind(mapper, clause, **kw)
+
+
+def _is_plain_read(clause) -> bool:
+    return (
+        isinstance(clause, SelectBase)
+        and getattr(clause, "_for_update_arg", None) is None
+    )
+
+
+class WriteClock:
+    """When a unit of work (or any copy of it) last committed a write."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.last_write_at = float("-inf")
+
+    def mark(self):
+        self.last_write_at = self.clock()
+
+    def since(self) -> float:
+        return self.clock() - self.last_write_at
+
+
+def round_robin() -> Callable[[Sequence[Engine]], Engine]:
+    counter = count()
+
+    def select(replicas):
+        return replicas[next(counter) % len(replicas)]
+    return select
+
+
+def random_choice() -> Callable[[Sequence[Engine]], Engine]:
+    return random.choice
+
+
+REPLICA_SELECTORS = {
+    "round_robin": round_robin,
+    "random": random_choice,
+}
@@ -0,0 +1,104 @@
+import re
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+
+from blog.adapters.orm import metadata
+from blog.adapters.engine import get_engine
+
+# plan lines that mean a table scan or a sort instead of an index walk;
+# "SCAN articles USING INDEX" under a LIMIT is an ordered index walk
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"^SCAN (TABLE )?\w+$|USE TEMP B-TREE"),
+    "postgresql": re.compile(r"Seq Scan on|^\s*(->\s*)?Sort"),
+}
+
+
+def upgrade_schema(engine: Engine):
+    # tables referencing articles.id expect the uuid type, so legacy text
+    # ids are converted before create_all adds their foreign keys
+    migrate_article_ids(engine)
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            _add_missing_columns(connection, table)
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
+
+
+def _add_missing_columns(connection: Connection, table):
+    # only columns with a server default can be added to a populated table
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing or column.server_default is None:
+            continue
+        column_type = column.type.compile(dialect=connection.dialect)
+        default = column.server_default.arg
+        null = "" if column.nullable else " NOT NULL"
+        connection.exec_driver_sql(
+            f"ALTER TABLE {table.name} ADD COLUMN {column.name} "
+            f"{column_type}{null} DEFAULT {default}"
+        )
+
+
+def migrate_article_ids(engine: Engine, batch_size: int = 1000) -> int:
+    """Convert legacy text article ids to the binary/uuid column storage."""
+    if not inspect(engine).has_table("articles"):
+        return 0
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            data_type = connection.exec_driver_sql(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'articles' AND column_name = 'id'"
+            ).scalar()
+            if data_type == "uuid":
+                return 0
+            count = connection.exec_driver_sql("SELECT count(*) FROM articles").scalar()
+            connection.exec_driver_sql(
+                "ALTER TABLE articles ALTER COLUMN id TYPE uuid USING id::uuid"
+            )
+            return count
+    if engine.dialect.name != "sqlite":
+        raise NotImplementedError(f"No id migration for {engine.dialect.name}")
+
+    # SQLite sorts text before blobs, so the unconverted ids are always the
+    # head of the primary key index and each batch stops after batch_size rows
+    converted = 0
+    while True:
+        with engine.begin() as connection:
+            ids = [row[0] for row in connection.exec_driver_sql(
+                "SELECT id FROM articles WHERE typeof(id) = 'text' ORDER BY id LIMIT ?",
+                (batch_size,),
+            )]
+            if not ids:
+                return converted
+            connection.exec_driver_sql(
+                "UPDATE articles SET id = ? WHERE id = ?",
+                [(UUID(article_id).bytes, article_id) for article_id in ids],
+            )
+            converted += len(ids)
+
+
+def query_plan(connection: Connection, statement) -> list:
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    if connection.dialect.name == "sqlite":
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+        return [row[-1] for row in rows]
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+    return [row[0] for row in rows]
+
+
+def full_scans(connection: Connection, statement) -> list:
+    pattern = FULL_SCAN_PATTERNS[connection.dialect.name]
+    return [
+        line for line in query_plan(connection, statement)
+        if pattern.search(line)
+    ]
+
+
+if __name__ == "__main__":
+    upgrade_schema(get_engine())
@@ -0,0 +1,32 @@
+import re
+from collections import Counter
+from typing import Dict, List
+
+TOKEN = re.compile(r"\w+")
+MAX_TERM_LENGTH = 64
+STOP_WORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "with",
+))
+# a hit in the title says more about an article than one deep in its content
+FIELD_WEIGHTS = {"title": 3, "description": 2, "content": 1}
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def document_terms(**fields) -> Dict[str, int]:
+    weights = Counter()
+    for name, text in fields.items():
+        for term, count in Counter(tokenize(text or "")).items():
+            weights[term] += count * FIELD_WEIGHTS[name]
+    return dict(weights)
+
+
+def query_terms(query: str) -> List[str]:
+    return list(dict.fromkeys(tokenize(query)))
@@ -1,9 +1,51 @@
 import os
+from dataclasses import dataclass
+from typing import List, Optional
 
 
 def get_database_uri() -> str:
+    if os.environ.get("DATABASE_URI"):
+        return os.environ["DATABASE_URI"]
     host = os.environ.get("DB_HOST", "localhost")
-    port = 5432
+    port = int(os.environ.get("DB_PORT", 5432))
     password = os.environ.get("DB_PASSWORD", "123")
     user, db_name = "blog", "blog"
     return f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
+
+
+def get_async_database_uri() -> str:
+    uri = get_database_uri()
+    if uri.startswith("sqlite://"):
+        return uri.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return uri.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+
+def get_replica_uris() -> List[str]:
+    uris = os.environ.get("DATABASE_REPLICA_URIS", "")
+    return [uri.strip() for uri in uris.split(",") if uri.strip()]
+
+
+def get_replica_selection() -> str:
+    return os.environ.get("DB_REPLICA_SELECTION", "round_robin")
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = 1800
+    pre_ping: bool = True
+    statement_timeout_ms: Optional[int] = None
+
+
+def get_pool_settings() -> PoolSettings:
+    statement_timeout = os.environ.get("DB_STATEMENT_TIMEOUT_MS")
+    return PoolSettings(
+        size=int(os.environ.get("DB_POOL_SIZE", 5)),
+        max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        recycle=int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        pre_ping=os.environ.get("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no"),
+        statement_timeout_ms=int(statement_timeout) if statement_timeout else None,
+    )
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import List
 
 
 @dataclass
@@ -36,3 +37,31 @@ class DeleteArticle(Command):
 class ArchiveArticle(Command):
     article_id: str
     user_id: int
+
+
+@dataclass
+class PublishArticles(Command):
+    article_ids: List[str]
+    user_id: int
+
+
+@dataclass
+class DeleteArticles(Command):
+    article_ids: List[str]
+    user_id: int
+
+
+@dataclass
+class ArchiveArticles(Command):
+    article_ids: List[str]
+    user_id: int
+
+
+@dataclass
+class RebuildArticleStats(Command):
+    pass
+
+
+@dataclass
+class RebuildSearchIndex(Command):
+    pass
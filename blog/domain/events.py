@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Event:
+    pass
+
+
+@dataclass
+class ArticleAdded(Event):
+    article_id: str
+    user_id: int
+
+
+@dataclass
+class ArticlePublished(Event):
+    article_id: str
+    user_id: int
+
+
+@dataclass
+class ArticleDeleted(Event):
+    article_id: str
+    user_id: int
+
+
+@dataclass
+class ArticleArchived(Event):
+    article_id: str
+    user_id: int
@@ -16,3 +16,7 @@ class ArticleNotFoundException(NotFoundException):
 
 class PermissionDeniedException(Exception):
     pass
+
+
+class ConcurrencyConflictException(Exception):
+    pass
@@ -1,12 +1,45 @@
+import os
+import threading
+import time
 from dataclasses import field, dataclass
 from datetime import datetime
-from uuid import uuid1
+from typing import NamedTuple
+from uuid import UUID
 
+from blog.domain import events
 from blog.domain.exceptions import InvalidStatusException
 
 
+_uuid7_lock = threading.Lock()
+_uuid7_last = [0, 0]  # last millisecond, 12-bit sequence within it
+
+
+def uuid7() -> UUID:
+    """RFC 9562 UUIDv7: 48-bit unix ms timestamp, then a per-ms sequence."""
+    random = int.from_bytes(os.urandom(8), "big")
+    with _uuid7_lock:
+        millis = time.time_ns() // 1_000_000
+        if millis > _uuid7_last[0]:
+            _uuid7_last[:] = [millis, random >> 53]  # start low to leave room
+        else:
+            millis = _uuid7_last[0]
+            _uuid7_last[1] += 1
+            if _uuid7_last[1] > 0xFFF:
+                millis = _uuid7_last[0] = millis + 1
+                _uuid7_last[1] = 0
+        sequence = _uuid7_last[1]
+    value = (
+        (millis & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | sequence << 64
+        | 0b10 << 62
+        | random & 0x3FFF_FFFF_FFFF_FFFF
+    )
+    return UUID(int=value)
+
+
 def get_new_uuid() -> str:
-    return str(uuid1())
+    return str(uuid7())
 
 
 class ArticleStatus:
@@ -15,6 +48,29 @@ class ArticleStatus:
     ARCHIVED = "archived"
     DELETED = "deleted"
 
+    ALL = (DRAFT, PUBLISHED, ARCHIVED, DELETED)
+
+
+# transition name -> (status the article must be in, status it moves to)
+TRANSITIONS = {
+    "publish": (ArticleStatus.DRAFT, ArticleStatus.PUBLISHED),
+    "delete": (ArticleStatus.DRAFT, ArticleStatus.DELETED),
+    "archive": (ArticleStatus.PUBLISHED, ArticleStatus.ARCHIVED),
+}
+
+TRANSITION_EVENTS = {
+    "publish": events.ArticlePublished,
+    "delete": events.ArticleDeleted,
+    "archive": events.ArticleArchived,
+}
+
+
+def next_status(status: str, transition: str) -> str:
+    required, target = TRANSITIONS[transition]
+    if status != required:
+        raise InvalidStatusException
+    return target
+
 
 @dataclass
 class Article:
@@ -25,6 +81,8 @@ class Article:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
     id: str = field(default_factory=get_new_uuid)
+    user_id: int = None
+    events: list = field(default_factory=list, repr=False, compare=False)
 
     def __eq__(self, other):
         return isinstance(other, Article) and self.id == other.id
@@ -33,20 +91,28 @@ class Article:
         return hash(self.id)
 
     def publish(self):
-        if self.status != ArticleStatus.DRAFT:
-            raise InvalidStatusException
-        print('changed status')
-        self.status = ArticleStatus.PUBLISHED
+        self.status = next_status(self.status, "publish")
+        self.events.append(events.ArticlePublished(self.id, self.user_id))
 
     def delete(self):
-        if self.status != ArticleStatus.DRAFT:
-            raise InvalidStatusException
-        self.status = ArticleStatus.DELETED
+        self.status = next_status(self.status, "delete")
+        self.events.append(events.ArticleDeleted(self.id, self.user_id))
 
     def archive(self):
-        if self.status != ArticleStatus.PUBLISHED:
-            raise InvalidStatusException
-        self.status = ArticleStatus.ARCHIVED
+        self.status = next_status(self.status, "archive")
+        self.events.append(events.ArticleArchived(self.id, self.user_id))
+
+
+class ArticleSummary(NamedTuple):
+    """An article without its content, for listings and permission checks."""
+
+    id: str
+    title: str
+    description: str
+    status: str
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
 
 
 @dataclass
@@ -58,3 +124,12 @@ class User:
 
     def add_article(self, article):
         self.articles.add(article)
+
+
+@dataclass
+class ArticleStats:
+    user_id: int
+    draft: int = 0
+    published: int = 0
+    archived: int = 0
+    deleted: int = 0
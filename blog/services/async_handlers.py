@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from functools import wraps
+from typing import TYPE_CHECKING
+
+from blog.domain import commands, events
+from blog.domain.exceptions import (
+    UserNotFoundException,
+    ArticleNotFoundException,
+    PermissionDeniedException,
+    ConcurrencyConflictException,
+)
+from blog.domain.models import User, Article
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import AsyncBlogUnitOfWork
+
+
+def retry_on_conflict(handler):
+    @wraps(handler)
+    async def wrapper(cmd, uow):
+        retries = 0
+        while True:
+            try:
+                return await handler(cmd, uow)
+            except ConcurrencyConflictException:
+                if retries >= uow.conflict_retries:
+                    raise
+                retries += 1
+                uow.conflicts += 1
+    return wrapper
+
+
+async def create_user(cmd: commands.CreateUser, uow: AsyncBlogUnitOfWork):
+    async with uow:
+        user = User(**asdict(cmd))
+        uow.users.add(user)
+        await uow.session.flush()
+        user_id = user.id
+        await uow.commit()
+        return user_id
+
+
+async def add_article(
+    cmd: commands.AddArticle,
+    uow: AsyncBlogUnitOfWork
+):
+    async with uow:
+        if not await uow.users.exists(cmd.user_id):
+            raise UserNotFoundException
+        article = Article(
+            cmd.title,
+            cmd.description,
+            cmd.content,
+            user_id=cmd.user_id,
+        )
+        article.events.append(events.ArticleAdded(article.id, cmd.user_id))
+        uow.articles.add(article)
+        await uow.stats.increment(cmd.user_id, **{article.status: 1})
+        await uow.search.index(article)
+        article_id = article.id
+        await uow.commit()
+        return article_id
+
+
+async def _get_owned_article(article_id, user_id, uow: AsyncBlogUnitOfWork):
+    article = await uow.articles.get(article_id)
+    if not article:
+        raise ArticleNotFoundException(f"Article not found with id {article_id}")
+    if article.user_id != user_id:
+        raise PermissionDeniedException(
+            f"User with {user_id} not allowed to change article {article_id}"
+        )
+    return article
+
+
+@retry_on_conflict
+async def publish_article(
+    cmd: commands.PublishArticle,
+    uow: AsyncBlogUnitOfWork
+):
+    async with uow:
+        article = await _get_owned_article(cmd.article_id, cmd.user_id, uow)
+        previous = article.status
+        article.publish()
+        await uow.stats.move(cmd.user_id, previous, article.status)
+        await uow.search.set_status([article.id], article.status)
+        await uow.commit()
+
+
+@retry_on_conflict
+async def delete_article(
+    cmd: commands.DeleteArticle,
+    uow: AsyncBlogUnitOfWork
+):
+    async with uow:
+        article = await _get_owned_article(cmd.article_id, cmd.user_id, uow)
+        previous = article.status
+        article.delete()
+        await uow.stats.move(cmd.user_id, previous, article.status)
+        await uow.search.remove([article.id])
+        await uow.commit()
+
+
+@retry_on_conflict
+async def archive_article(
+    cmd: commands.ArchiveArticle,
+    uow: AsyncBlogUnitOfWork,
+):
+    async with uow:
+        article = await _get_owned_article(cmd.article_id, cmd.user_id, uow)
+        previous = article.status
+        article.archive()
+        await uow.stats.move(cmd.user_id, previous, article.status)
+        await uow.search.set_status([article.id], article.status)
+        await uow.commit()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List
+
+from blog.domain import commands, events
+from blog.domain.exceptions import (
+    UserNotFoundException,
+    ArticleNotFoundException,
+    PermissionDeniedException,
+    InvalidStatusException,
+    ConcurrencyConflictException,
+)
+from blog.domain.models import (
+    User,
+    ArticleStatus,
+    TRANSITION_EVENTS,
+    get_new_uuid,
+    next_status,
+)
+from blog.services.handlers import retry_on_conflict
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+DEFAULT_CHUNK_SIZE = 500
+
+TRANSITION_COMMANDS = {
+    commands.PublishArticle: "publish",
+    commands.DeleteArticle: "delete",
+    commands.ArchiveArticle: "archive",
+}
+
+
+@dataclass
+class BatchResult:
+    results: List[Any] = field(default_factory=list)
+    errors: Dict[int, Exception] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> int:
+        return len(self.results) - len(self.errors)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+
+def execute_batch(
+    cmds: Iterable[commands.Command],
+    uow: BlogUnitOfWork,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Run commands in chunked transactions, one commit per chunk.
+
+    Every command is validated against the chunk state before anything is
+    written, so a bad command is reported in ``errors`` (keyed by its
+    position in ``cmds``) while the rest of its chunk still commits.
+    """
+    result = BatchResult()
+    cmds = iter(cmds)
+    while True:
+        chunk = list(islice(cmds, chunk_size))
+        if not chunk:
+            return result
+        offset = len(result.results)
+        try:
+            results, errors = _execute_chunk(chunk, uow)
+        except ConcurrencyConflictException as error:
+            results, errors = [None] * len(chunk), dict.fromkeys(range(len(chunk)), error)
+        result.results.extend(results)
+        result.errors.update(
+            (offset + index, error) for index, error in errors.items()
+        )
+
+
+@retry_on_conflict
+def _execute_chunk(chunk, uow):
+    results = [None] * len(chunk)
+    errors = {}
+    with uow:
+        try:
+            new_users = [
+                (index, User(**asdict(cmd)))
+                for index, cmd in enumerate(chunk)
+                if isinstance(cmd, commands.CreateUser)
+            ]
+            for _, user in new_users:
+                uow.users.add(user)
+            uow.session.flush()
+            for index, user in new_users:
+                results[index] = user.id
+
+            user_ids = {
+                cmd.user_id for cmd in chunk
+                if isinstance(cmd, commands.AddArticle)
+            }
+            existing_users = {
+                row.id for row in uow.users.get_values(user_ids, "id")
+            } if user_ids else set()
+
+            article_ids = {
+                cmd.article_id for cmd in chunk
+                if type(cmd) in TRANSITION_COMMANDS
+            }
+            states = {
+                row.id: [row.user_id, row.status]
+                for row in uow.articles.get_values(
+                    article_ids, "id", "user_id", "status"
+                )
+            } if article_ids else {}
+            original = {
+                article_id: status for article_id, (_, status) in states.items()
+            }
+
+            now = datetime.utcnow()
+            new_articles = {}
+            changed = set()
+            queued = []
+            for index, cmd in enumerate(chunk):
+                if isinstance(cmd, commands.CreateUser):
+                    continue
+                try:
+                    if isinstance(cmd, commands.AddArticle):
+                        if cmd.user_id not in existing_users:
+                            raise UserNotFoundException
+                        article_id = get_new_uuid()
+                        new_articles[article_id] = dict(
+                            id=article_id,
+                            title=cmd.title,
+                            description=cmd.description,
+                            content=cmd.content,
+                            status=ArticleStatus.DRAFT,
+                            user_id=cmd.user_id,
+                            created_at=now,
+                            updated_at=now,
+                        )
+                        states[article_id] = [cmd.user_id, ArticleStatus.DRAFT]
+                        results[index] = article_id
+                        queued.append(events.ArticleAdded(article_id, cmd.user_id))
+                    elif type(cmd) in TRANSITION_COMMANDS:
+                        state = states.get(cmd.article_id)
+                        if not state:
+                            raise ArticleNotFoundException(
+                                f"Article not found with id {cmd.article_id}"
+                            )
+                        if state[0] != cmd.user_id:
+                            raise PermissionDeniedException(
+                                f"User with {cmd.user_id} not allowed to change "
+                                f"article {cmd.article_id}"
+                            )
+                        transition = TRANSITION_COMMANDS[type(cmd)]
+                        state[1] = next_status(state[1], transition)
+                        changed.add(cmd.article_id)
+                        queued.append(
+                            TRANSITION_EVENTS[transition](cmd.article_id, cmd.user_id)
+                        )
+                    else:
+                        raise TypeError(f"Cannot batch {type(cmd).__name__}")
+                except (
+                    UserNotFoundException,
+                    ArticleNotFoundException,
+                    PermissionDeniedException,
+                    InvalidStatusException,
+                    TypeError,
+                ) as error:
+                    errors[index] = error
+
+            for article_id, row in new_articles.items():
+                row["status"] = states[article_id][1]
+            uow.articles.add_many(list(new_articles.values()))
+
+            # guarded on the status validated above, so a concurrent writer
+            # turns into a conflict and a rerun of the chunk
+            by_transition = {}
+            for article_id in changed - new_articles.keys():
+                user_id, status = states[article_id]
+                by_transition.setdefault(
+                    (user_id, original[article_id], status), []
+                ).append(article_id)
+            for (user_id, previous, status), ids in by_transition.items():
+                if uow.articles.transition(ids, user_id, previous, status) != len(ids):
+                    raise ConcurrencyConflictException(
+                        f"Articles changed while running the batch: {ids}"
+                    )
+                if status == ArticleStatus.DELETED:
+                    uow.search.remove(ids)
+                else:
+                    uow.search.set_status(ids, status)
+            uow.search.add_many(
+                row for row in new_articles.values()
+                if row["status"] != ArticleStatus.DELETED
+            )
+
+            for user_id, deltas in _stats_deltas(
+                states, original, new_articles.keys(), changed
+            ).items():
+                uow.stats.increment(user_id, **deltas)
+
+            # queued like the handlers' events, so they reach the outbox too
+            uow.articles.events.extend(queued)
+            uow.commit()
+        except ConcurrencyConflictException:
+            uow.rollback()
+            raise
+        except Exception as error:
+            uow.rollback()
+            for index in range(len(chunk)):
+                results[index] = None
+                errors.setdefault(index, error)
+    return results, errors
+
+
+def _stats_deltas(states, original, new_ids, changed_ids):
+    deltas = {}
+    for article_id in set(new_ids) | set(changed_ids):
+        user_id, status = states[article_id]
+        counts = deltas.setdefault(user_id, {})
+        counts[status] = counts.get(status, 0) + 1
+        if article_id in original:
+            previous = original[article_id]
+            counts[previous] = counts.get(previous, 0) - 1
+    return {
+        user_id: {status: delta for status, delta in counts.items() if delta}
+        for user_id, counts in deltas.items()
+        if any(counts.values())
+    }
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, TextIO, Union
+
+from blog.domain import commands, events
+from blog.domain.exceptions import UserNotFoundException
+from blog.domain.models import ArticleStatus, get_new_uuid
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+DEFAULT_CHUNK_SIZE = 5000
+FORMATS = ("ndjson", "csv")
+RECORD_TYPES = {
+    "user": commands.CreateUser,
+    "article": commands.AddArticle,
+}
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    errors: Dict[int, Exception] = field(default_factory=dict)
+    # records consumed so far, including those skipped when resuming
+    position: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.imported / self.seconds if self.seconds else 0.0
+
+
+def read_records(stream: TextIO, format: str) -> Iterator[Union[dict, str]]:
+    """Yield one record per non-empty line or row.
+
+    NDJSON lines are yielded undecoded; parse_record decodes them, so a
+    corrupt line is reported as that record's error instead of ending the
+    import.
+    """
+    if format == "ndjson":
+        for line in stream:
+            if line.strip():
+                yield line
+    elif format == "csv":
+        for row in csv.DictReader(stream):
+            # columns another record type uses are left empty
+            yield {key: value for key, value in row.items() if value != ""}
+    else:
+        raise ValueError(f"Unknown import format {format!r}")
+
+
+def parse_record(record: Union[dict, str], record_type: str = None) -> commands.Command:
+    """Build the command a record or NDJSON line describes, or raise ValueError."""
+    if isinstance(record, str):
+        record = json.loads(record)
+    record = dict(record)
+    record_type = record.pop("type", record_type)
+    command = RECORD_TYPES.get(record_type)
+    if command is None:
+        raise ValueError(f"Unknown record type {record_type!r}")
+    names = {f.name: f.type for f in fields(command)}
+    missing = names.keys() - record.keys()
+    unknown = record.keys() - names.keys()
+    if missing or unknown:
+        raise ValueError(
+            f"{record_type} record has missing fields {sorted(missing)} "
+            f"and unknown fields {sorted(unknown)}"
+        )
+    values = {}
+    for name, kind in names.items():
+        value = record[name]
+        if kind is int and isinstance(value, str):
+            value = int(value)
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ValueError(f"{record_type}.{name} must be {kind.__name__}")
+        values[name] = value
+    return command(**values)
+
+
+def import_records(
+    records: Iterable[Union[dict, str]],
+    uow: BlogUnitOfWork,
+    name: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    record_type: str = None,
+    progress: Callable[[ImportResult], None] = None,
+) -> ImportResult:
+    """Insert records in chunked transactions, resuming after checkpoint ``name``.
+
+    Each chunk commits together with its checkpoint, so a rerun after a
+    crash picks up at the first uncommitted record. Invalid records and
+    articles for unknown users are reported in ``errors`` by record index.
+    User records cannot carry an id, so article records can only reference
+    users that already exist, not users created by the same import.
+    """
+    started = time.perf_counter()
+    with uow:
+        position = uow.checkpoints.get(name)
+    result = ImportResult(position=position)
+    records = islice(enumerate(records), position, None)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        parsed = []
+        for index, record in chunk:
+            try:
+                parsed.append((index, parse_record(record, record_type)))
+            except (ValueError, TypeError) as error:
+                result.errors[index] = error
+        result.position = chunk[-1][0] + 1
+        imported, errors = _import_chunk(parsed, uow, name, result.position)
+        result.imported += imported
+        result.errors.update(errors)
+        result.seconds = time.perf_counter() - started
+        if progress is not None:
+            progress(result)
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def _import_chunk(parsed, uow, name, position):
+    errors = {}
+    with uow:
+        users = [
+            asdict(cmd) for _, cmd in parsed
+            if isinstance(cmd, commands.CreateUser)
+        ]
+        uow.users.add_many(users)
+
+        new_articles = [
+            (index, cmd) for index, cmd in parsed
+            if isinstance(cmd, commands.AddArticle)
+        ]
+        user_ids = {cmd.user_id for _, cmd in new_articles}
+        existing_users = {
+            row.id for row in uow.users.get_values(user_ids, "id")
+        } if user_ids else set()
+
+        now = datetime.utcnow()
+        rows = []
+        counts = Counter()
+        for index, cmd in new_articles:
+            if cmd.user_id not in existing_users:
+                errors[index] = UserNotFoundException(
+                    f"User not found with id {cmd.user_id}"
+                )
+                continue
+            rows.append(dict(
+                id=get_new_uuid(),
+                title=cmd.title,
+                description=cmd.description,
+                content=cmd.content,
+                status=ArticleStatus.DRAFT,
+                user_id=cmd.user_id,
+                created_at=now,
+                updated_at=now,
+            ))
+            counts[cmd.user_id] += 1
+        uow.articles.add_many(rows)
+        for user_id, count in counts.items():
+            uow.stats.increment(user_id, **{ArticleStatus.DRAFT: count})
+        uow.search.add_many(rows)
+        uow.articles.events.extend(
+            events.ArticleAdded(row["id"], row["user_id"]) for row in rows
+        )
+
+        uow.checkpoints.save(name, position)
+        uow.commit()
+    return len(users) + len(rows), errors
+
+
+def import_file(
+    path: str,
+    uow: BlogUnitOfWork,
+    format: str = None,
+    name: str = None,
+    **kwargs,
+) -> ImportResult:
+    format = format or os.path.splitext(path)[1].lstrip(".")
+    with open(path, newline="") as stream:
+        return import_records(
+            read_records(stream, format),
+            uow,
+            name or os.path.basename(path),
+            **kwargs,
+        )
+
+
+def _report(result: ImportResult):
+    print(
+        f"{result.position} records read, {result.imported} imported, "
+        f"{len(result.errors)} rejected, {result.rows_per_second:.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+    parser = argparse.ArgumentParser(description="Bulk import users and articles.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--type", choices=sorted(RECORD_TYPES), dest="record_type")
+    parser.add_argument("--name", help="checkpoint name, defaults to the file name")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+    result = import_file(
+        args.path,
+        BlogUnitOfWork(),
+        format=args.format,
+        name=args.name,
+        chunk_size=args.chunk_size,
+        record_type=args.record_type,
+        progress=_report,
+    )
+    for index, error in sorted(result.errors.items()):
+        print(f"record {index}: {error!r}", file=sys.stderr)
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import count
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, List, Optional
+
+from blog.domain import commands
+from blog.services.message_bus import bootstrap
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import AbstractUnitOfWork
+
+
+@dataclass
+class CommandOutcome:
+    command: commands.Command
+    result: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def aggregate_key(command: commands.Command) -> Optional[Hashable]:
+    # every article command carries its owner, so keying on the user orders
+    # commands for one article and for one user's stats row alike
+    return getattr(command, "user_id", None)
+
+
+class CommandExecutor:
+    """Runs commands on a fixed set of worker lanes, one thread per lane.
+
+    Commands with the same aggregate key always go to the same lane and run
+    in submission order; other commands run concurrently. Each lane has its
+    own message bus and its own copy of the unit of work, so no session is
+    ever shared between threads.
+    """
+
+    def __init__(self, uow: AbstractUnitOfWork, workers: int = 4):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self._buses = [bootstrap(copy.copy(uow)) for _ in range(workers)]
+        self._lanes = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"blog-lane-{lane}")
+            for lane in range(workers)
+        ]
+        self._round_robin = count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def lane(self, command: commands.Command) -> int:
+        key = aggregate_key(command)
+        if key is None:
+            return next(self._round_robin) % self.workers
+        return hash(key) % self.workers
+
+    def submit(self, command: commands.Command) -> Future:
+        lane = self.lane(command)
+        return self._lanes[lane].submit(self._buses[lane].handle, command)
+
+    def execute(self, cmds: Iterable[commands.Command]) -> List[CommandOutcome]:
+        """Run every command and return their outcomes in submission order."""
+        submitted = [(command, self.submit(command)) for command in cmds]
+        outcomes = []
+        for command, future in submitted:
+            error = future.exception()
+            outcomes.append(CommandOutcome(
+                command,
+                result=None if error else future.result(),
+                error=error,
+            ))
+        return outcomes
+
+    def shutdown(self, wait: bool = True):
+        for lane in self._lanes:
+            lane.shutdown(wait=wait)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+EXPORT_COLUMNS = (
+    "id", "title", "description", "content", "status",
+    "user_id", "created_at", "updated_at",
+)
+FORMATS = ("ndjson", "csv")
+
+
+def export_articles(
+    out: TextIO,
+    uow: BlogUnitOfWork,
+    format: str = "ndjson",
+    chunk_size: int = 1000,
+    **filters,
+) -> int:
+    """Write articles to ``out`` one chunk at a time; returns the row count.
+
+    ``filters`` are user_id, status and updated_since. Peak memory is one
+    chunk of rows whatever the table size.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format {format!r}")
+    writer = None
+    if format == "csv":
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_COLUMNS)
+    count = 0
+    with uow:
+        for rows in uow.articles.stream(EXPORT_COLUMNS, chunk_size, **filters):
+            if writer is not None:
+                writer.writerows(_plain(row) for row in rows)
+            else:
+                out.write("".join(
+                    json.dumps(dict(zip(EXPORT_COLUMNS, _plain(row)))) + "\n"
+                    for row in rows
+                ))
+            count += len(rows)
+    return count
+
+
+def _plain(row):
+    return [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in row
+    ]
+
+
+def main(argv=None):
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+    parser = argparse.ArgumentParser(description="Stream articles to stdout.")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--user-id", type=int)
+    parser.add_argument("--status")
+    parser.add_argument("--updated-since", type=datetime.fromisoformat)
+    args = parser.parse_args(argv)
+    export_articles(
+        sys.stdout,
+        BlogUnitOfWork(),
+        format=args.format,
+        chunk_size=args.chunk_size,
+        user_id=args.user_id,
+        status=args.status,
+        updated_since=args.updated_since,
+    )
+
+
+if __name__ == "__main__":
+    main()
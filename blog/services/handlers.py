@@ -1,13 +1,43 @@
+from __future__ import annotations
+
 from dataclasses import asdict
+from functools import wraps
+from typing import TYPE_CHECKING
 
-from blog.domain import commands
+from blog.domain import commands, events
 from blog.domain.exceptions import (
     UserNotFoundException,
     ArticleNotFoundException,
     PermissionDeniedException,
+    ConcurrencyConflictException,
+)
+from blog.domain.models import (
+    User,
+    Article,
+    ArticleStatus,
+    TRANSITIONS,
+    TRANSITION_EVENTS,
+    next_status,
 )
-from blog.domain.models import User, Article
-from blog.services.unit_of_work import BlogUnitOfWork
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+
+def retry_on_conflict(handler):
+    """Rerun the handler, up to uow.conflict_retries times, after a conflict."""
+    @wraps(handler)
+    def wrapper(cmd, uow):
+        retries = 0
+        while True:
+            try:
+                return handler(cmd, uow)
+            except ConcurrencyConflictException:
+                if retries >= uow.conflict_retries:
+                    raise
+                retries += 1
+                uow.conflicts += 1
+    return wrapper
 
 
 def create_user(cmd: commands.CreateUser, uow: BlogUnitOfWork):
@@ -23,63 +53,128 @@ def add_article(
     uow: BlogUnitOfWork
 ):
     with uow:
-        user = uow.users.get(cmd.user_id)
-        if not user:
+        if not uow.users.exists(cmd.user_id):
             raise UserNotFoundException
         article = Article(
             cmd.title,
             cmd.description,
-            cmd.content
+            cmd.content,
+            user_id=cmd.user_id,
         )
-        user.add_article(article)
-        uow.session.commit()
-        return article.id
+        article.events.append(events.ArticleAdded(article.id, cmd.user_id))
+        uow.articles.add(article)
+        uow.stats.increment(cmd.user_id, **{article.status: 1})
+        uow.search.index(article)
+        article_id = article.id
+        uow.commit()
+        return article_id
 
 
+@retry_on_conflict
 def publish_article(
     cmd: commands.PublishArticle,
     uow: BlogUnitOfWork
 ):
-    with uow:
-        article = uow.articles.get(cmd.article_id)
-        if not article:
-            raise ArticleNotFoundException(f"Article not found with id {cmd.article_id}")
-        if article.user_id != cmd.user_id:
-            raise PermissionDeniedException(
-                f"User with {cmd.user_id} not allowed to change article {cmd.article_id}"
-            )
-
-        article.publish()
-        uow.session.commit()
+    _transition([cmd.article_id], cmd.user_id, "publish", uow)
 
 
+@retry_on_conflict
 def delete_article(
     cmd: commands.DeleteArticle,
     uow: BlogUnitOfWork
 ):
-    with uow:
-        article = uow.articles.get(cmd.article_id)
-        if not article:
-            raise ArticleNotFoundException(f"Article not found with id {cmd.article_id}")
-        if article.user_id != cmd.user_id:
-            raise PermissionDeniedException(
-                f"User with {cmd.user_id} not allowed to change article {cmd.article_id}"
-            )
-        article.delete()
-        uow.session.commit()
+    _transition([cmd.article_id], cmd.user_id, "delete", uow)
 
 
+@retry_on_conflict
 def archive_article(
     cmd: commands.ArchiveArticle,
     uow: BlogUnitOfWork,
 ):
+    _transition([cmd.article_id], cmd.user_id, "archive", uow)
+
+
+@retry_on_conflict
+def publish_articles(
+    cmd: commands.PublishArticles,
+    uow: BlogUnitOfWork,
+):
+    _transition(cmd.article_ids, cmd.user_id, "publish", uow)
+
+
+@retry_on_conflict
+def delete_articles(
+    cmd: commands.DeleteArticles,
+    uow: BlogUnitOfWork,
+):
+    _transition(cmd.article_ids, cmd.user_id, "delete", uow)
+
+
+@retry_on_conflict
+def archive_articles(
+    cmd: commands.ArchiveArticles,
+    uow: BlogUnitOfWork,
+):
+    _transition(cmd.article_ids, cmd.user_id, "archive", uow)
+
+
+def _transition(article_ids, user_id, transition, uow: BlogUnitOfWork):
+    # one guarded UPDATE instead of load-modify-save; the articles are only
+    # read back to pick the right exception when the guard rejects one
+    article_ids = list(dict.fromkeys(article_ids))
+    if not article_ids:
+        return
+    required, target = TRANSITIONS[transition]
     with uow:
-        article = uow.articles.get(cmd.article_id)
-        if not article:
-            raise ArticleNotFoundException(f"Article not found with id {cmd.article_id}")
-        if article.user_id != cmd.user_id:
+        changed = uow.articles.transition(article_ids, user_id, required, target)
+        if changed != len(article_ids):
+            uow.rollback()
+            _raise_transition_error(article_ids, user_id, transition, uow)
+        uow.stats.increment(user_id, **{required: -changed, target: changed})
+        if target == ArticleStatus.DELETED:
+            uow.search.remove(article_ids)
+        else:
+            uow.search.set_status(article_ids, target)
+        uow.articles.events.extend(
+            TRANSITION_EVENTS[transition](article_id, user_id)
+            for article_id in article_ids
+        )
+        uow.commit()
+
+
+def _raise_transition_error(article_ids, user_id, transition, uow: BlogUnitOfWork):
+    states = {
+        row.id: row
+        for row in uow.articles.get_values(article_ids, "id", "user_id", "status")
+    }
+    for article_id in article_ids:
+        state = states.get(article_id)
+        if state is None:
+            raise ArticleNotFoundException(f"Article not found with id {article_id}")
+        if state.user_id != user_id:
             raise PermissionDeniedException(
-                f"User with {cmd.user_id} not allowed to change article {cmd.article_id}"
+                f"User with {user_id} not allowed to change article {article_id}"
             )
-        article.archive()
-        uow.session.commit()
+        next_status(state.status, transition)
+    # every article looks valid again, so another writer got in between
+    raise ConcurrencyConflictException(
+        f"Articles changed while applying {transition}: {article_ids}"
+    )
+
+
+def rebuild_article_stats(
+    cmd: commands.RebuildArticleStats,
+    uow: BlogUnitOfWork,
+):
+    with uow:
+        uow.stats.rebuild()
+        uow.commit()
+
+
+def rebuild_search_index(
+    cmd: commands.RebuildSearchIndex,
+    uow: BlogUnitOfWork,
+):
+    with uow:
+        uow.search.rebuild()
+        uow.commit()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Union, Dict, Type, List, Callable, Deque
+
+from blog.adapters.instrumentation import command_label
+from blog.domain import commands, events
+from blog.services import handlers
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import AbstractUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+Message = Union[commands.Command, events.Event]
+
+COMMAND_HANDLERS: Dict[Type[commands.Command], Callable] = {
+    commands.CreateUser: handlers.create_user,
+    commands.AddArticle: handlers.add_article,
+    commands.PublishArticle: handlers.publish_article,
+    commands.DeleteArticle: handlers.delete_article,
+    commands.ArchiveArticle: handlers.archive_article,
+    commands.PublishArticles: handlers.publish_articles,
+    commands.DeleteArticles: handlers.delete_articles,
+    commands.ArchiveArticles: handlers.archive_articles,
+    commands.RebuildArticleStats: handlers.rebuild_article_stats,
+    commands.RebuildSearchIndex: handlers.rebuild_search_index,
+}
+
+EVENT_HANDLERS: Dict[Type[events.Event], List[Callable]] = {}
+
+
+@dataclass
+class MessageBus:
+    handlers: Dict[Type[Message], List[Callable]] = field(default_factory=dict)
+    queue: Deque[Message] = field(default_factory=deque)
+    uow: AbstractUnitOfWork = None
+
+    def subscribe(self, event: Type[Message], fn: Callable):
+        if event not in self.handlers:
+            self.handlers[event] = [fn]
+            return
+        self.handlers[event].append(fn)
+
+    def handle(self, message: Message):
+        self.queue.append(message)
+        result = None
+        try:
+            while self.queue:
+                current = self.queue.popleft()
+                if isinstance(current, commands.Command):
+                    outcome = self._handle_command(current)
+                    if current is message:
+                        result = outcome
+                else:
+                    self._handle_event(current)
+        except Exception:
+            self.queue.clear()
+            raise
+        return result
+
+    def _handle_command(self, command: commands.Command):
+        try:
+            fn, = self.handlers[type(command)]
+        except (KeyError, ValueError):
+            raise LookupError(
+                f"Expected exactly one handler for {type(command).__name__}"
+            )
+        with command_label(type(command).__name__):
+            result = fn(command, self.uow)
+        self.queue.extend(self.uow.collect_new_events())
+        return result
+
+    def _handle_event(self, event: events.Event):
+        for fn in self.handlers.get(type(event), ()):
+            try:
+                fn(event, self.uow)
+            except Exception:
+                logger.exception("Exception handling event %s", event)
+                continue
+            self.queue.extend(self.uow.collect_new_events())
+
+
+def bootstrap(uow: AbstractUnitOfWork = None) -> MessageBus:
+    if uow is None:
+        from blog.services.unit_of_work import BlogUnitOfWork
+        uow = BlogUnitOfWork()
+    bus = MessageBus(uow=uow)
+    for command, fn in COMMAND_HANDLERS.items():
+        bus.subscribe(command, fn)
+    for event, fns in EVENT_HANDLERS.items():
+        for fn in fns:
+            bus.subscribe(event, fn)
+    return bus
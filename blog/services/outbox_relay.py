@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from blog.adapters.instrumentation import DURATION_BUCKETS, Histogram
+
+if TYPE_CHECKING:
+    from blog.adapters.outbox import Sink
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Delivers outbox messages to a sink in batches, oldest first.
+
+    A batch is marked delivered in the transaction that read it, after the
+    sink accepted it; a sink failure leaves the batch pending for the next
+    run, so delivery is at least once.
+    """
+
+    def __init__(
+        self,
+        uow: BlogUnitOfWork,
+        sink: Sink,
+        batch_size: int = 100,
+        interval: float = 1.0,
+    ):
+        self.uow = copy.copy(uow)
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval = interval
+        self.delivered = 0
+        self.failures = 0
+        # seconds between the commit that wrote a message and its delivery
+        self.lag = Histogram(DURATION_BUCKETS)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_once(self) -> int:
+        with self.uow:
+            messages = self.uow.outbox.pending(self.batch_size)
+            if not messages:
+                return 0
+            self.sink.send(messages)
+            delivered_at = datetime.utcnow()
+            self.uow.outbox.mark_delivered(
+                [message.id for message in messages], delivered_at
+            )
+            self.uow.commit()
+        for message in messages:
+            self.lag.observe((delivered_at - message.created_at).total_seconds())
+        self.delivered += len(messages)
+        return len(messages)
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                delivered = self.run_once()
+            except Exception:
+                logger.exception("Outbox delivery failed")
+                self.failures += 1
+                delivered = 0
+            # keep draining while batches come back full
+            if delivered < self.batch_size:
+                self._stop.wait(self.interval)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="outbox-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "delivered": self.delivered,
+            "failures": self.failures,
+            "lag_seconds": self.lag.to_dict(),
+        }
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def move_cold_articles(
+    uow: BlogUnitOfWork,
+    older_than: timedelta,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    pause: float = 0.1,
+    now: datetime = None,
+) -> int:
+    """Move archived and deleted articles untouched for ``older_than`` to cold storage.
+
+    Each batch is its own short transaction, with ``pause`` seconds between
+    batches so the job never holds locks for long or starves live writers.
+    Returns how many articles were moved.
+    """
+    updated_before = (now or datetime.utcnow()) - older_than
+    moved = 0
+    while True:
+        with uow:
+            article_ids = uow.articles.move_to_cold(updated_before, batch_size)
+            uow.commit()
+        moved += len(article_ids)
+        if len(article_ids) < batch_size:
+            return moved
+        time.sleep(pause)
+
+
+def main(argv=None):
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+    parser = argparse.ArgumentParser(
+        description="Move old archived and deleted articles to the cold table."
+    )
+    parser.add_argument("--days", type=float, default=90)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=0.1)
+    args = parser.parse_args(argv)
+    moved = move_cold_articles(
+        BlogUnitOfWork(),
+        timedelta(days=args.days),
+        batch_size=args.batch_size,
+        pause=args.pause,
+    )
+    print(f"moved {moved} articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,40 @@
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from typing import Callable, Sequence
 
-from sqlalchemy import create_engine
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm.util import identity_key
 
-from blog.adapters.repositories import SqlAlchemyRepository
-from blog.config import get_database_uri
-from blog.domain.models import User, Article
+from blog.adapters.cache import EntityCache
+from blog.adapters.engine import (
+    get_engine,
+    get_replica_engines,
+    create_async_engine_from_config,
+)
+from blog.adapters.instrumentation import Instrumentation
+from blog.adapters.orm import start_mappers
+from blog.adapters.routing import REPLICA_SELECTORS, RoutingSession, WriteClock
+from blog.adapters.repositories import (
+    SqlAlchemyRepository,
+    ArticleRepository,
+    AsyncSqlAlchemyRepository,
+    AsyncArticleRepository,
+    ArticleStatsRepository,
+    AsyncArticleStatsRepository,
+    CheckpointRepository,
+    OutboxRepository,
+    AsyncOutboxRepository,
+    SearchRepository,
+    AsyncSearchRepository,
+)
+from blog.domain.exceptions import ConcurrencyConflictException
+from blog.config import get_replica_selection
+from blog.domain.models import User
 
 
 class AbstractUnitOfWork(ABC):
@@ -25,28 +53,220 @@ class AbstractUnitOfWork(ABC):
     def rollback(self):
         raise NotImplementedError
 
+    @abstractmethod
+    def collect_new_events(self):
+        raise NotImplementedError
 
-DEFAULT_SESSION_FACTORY = sessionmaker(
-    bind=create_engine(get_database_uri())
-)
+
+ARTICLES_ORDER_BY = ('created_at', 'id')
+
+_session_factory = None
+
+
+def get_session_factory() -> sessionmaker:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(bind=get_engine(), class_=RoutingSession)
+    return _session_factory
+
+
+def __getattr__(name):
+    # DEFAULT_SESSION_FACTORY used to be built at import time
+    if name == 'DEFAULT_SESSION_FACTORY':
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass
 class BlogUnitOfWork(AbstractUnitOfWork):
-    session_factory: sessionmaker = DEFAULT_SESSION_FACTORY
+    session_factory: sessionmaker = None
+    cache: EntityCache = None
+    instrumentation: Instrumentation = None
+    # how often a handler reruns after losing an optimistic version check
+    conflict_retries: int = 3
+    conflicts: int = field(default=0, init=False, compare=False)
+    # read-only units of work send plain reads to a replica; None means the
+    # replicas from DATABASE_REPLICA_URIS
+    read_only: bool = False
+    replicas: Sequence[Engine] = None
+    replica_selector: Callable[[Sequence[Engine]], Engine] = None
+    # stay on the primary this long after a commit, for read-your-writes
+    read_your_writes_seconds: float = 0.0
+    # shared with copies made by reader(), so they see this one's commits
+    write_clock: WriteClock = field(default_factory=WriteClock, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.replica_selector is None:
+            self.replica_selector = REPLICA_SELECTORS[get_replica_selection()]()
+
+    def reader(self) -> 'BlogUnitOfWork':
+        return replace(self, read_only=True)
 
     def __enter__(self, *args):
-        self.session = self.session_factory()
-        self.users = SqlAlchemyRepository(User, self.session)
-        self.articles = SqlAlchemyRepository(Article, self.session)
+        self._metrics = None
+        if self.instrumentation is not None:
+            self._metrics = self.instrumentation.start()
+        start_mappers()
+        self.session = (self.session_factory or get_session_factory())()
+        replica = self._choose_replica()
+        if replica is not None:
+            if not isinstance(self.session, RoutingSession):
+                raise TypeError("Replica reads need a RoutingSession session factory")
+            self.session.info['replica'] = replica
+        self.users = SqlAlchemyRepository(User, self.session, cache=self.cache)
+        self.articles = ArticleRepository(
+            self.session, order_by=ARTICLES_ORDER_BY, cache=self.cache
+        )
+        self.stats = ArticleStatsRepository(self.session, cache=self.cache)
+        self.search = SearchRepository(self.session)
+        self.checkpoints = CheckpointRepository(self.session)
+        self.outbox = OutboxRepository(self.session)
+        self._flushed = set()
+        self._recorded = {}
+        if self.cache is not None:
+            event.listen(self.session, 'after_flush', self._record_flush)
+        if self._metrics is not None:
+            self.instrumentation.watch(self.session.get_bind())
+            if replica is not None:
+                self.instrumentation.watch(replica)
+            self.instrumentation.watch_session(self.session)
+            self._metrics.phases['enter'] = time.perf_counter() - self._metrics.started_at
         return super().__enter__()
 
-    def __exit__(self, *args):
-        super().__exit__(*args)
-        self.session.close()
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            super().__exit__(exc_type, exc, traceback)
+            self.session.close()
+        finally:
+            if self._metrics is not None:
+                self.instrumentation.finish(self._metrics)
+        # a version check can fail on commit or on any autoflush before it
+        if isinstance(exc, StaleDataError):
+            raise ConcurrencyConflictException(str(exc)) from exc
 
     def commit(self):
-        self.session.commit()
+        self.outbox.add_many(_unrecorded_events(self._recorded, self.users, self.articles))
+        if self._metrics is None:
+            self.session.commit()
+        else:
+            with self.instrumentation.phase(self._metrics, 'commit'):
+                self.session.commit()
+        if self.cache is not None:
+            self.cache.evict(self._written_keys())
+        self._clear_writes()
+        if self.session.info.get('wrote'):
+            self.write_clock.mark()
+
+    def _choose_replica(self):
+        if not self.read_only:
+            return None
+        replicas = self.replicas if self.replicas is not None else get_replica_engines()
+        if not replicas or self.write_clock.since() < self.read_your_writes_seconds:
+            return None
+        return self.replica_selector(replicas)
 
     def rollback(self):
         self.session.rollback()
+        if self.cache is not None:
+            # gets inside the transaction may have cached its own writes
+            self.cache.evict(self._written_keys())
+        self._clear_writes()
+        self._recorded.clear()
+
+    def _record_flush(self, session, flush_context):
+        for entity in (*session.new, *session.dirty, *session.deleted):
+            self._flushed.add(inspect(entity).mapper.identity_key_from_instance(entity))
+
+    def _written_keys(self):
+        keys = set(self._flushed)
+        for repository in (self.users, self.articles, self.stats):
+            keys.update(
+                identity_key(repository.model, entity_id)
+                for entity_id in repository.written
+            )
+        return keys
+
+    def _clear_writes(self):
+        self._flushed.clear()
+        for repository in (self.users, self.articles, self.stats):
+            repository.written.clear()
+
+    def collect_new_events(self):
+        return _collect_new_events(self.users, self.articles)
+
+
+_async_session_factory = None
+
+
+def get_async_session_factory() -> sessionmaker:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = sessionmaker(
+            bind=create_async_engine_from_config(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+@dataclass
+class AsyncBlogUnitOfWork:
+    session_factory: sessionmaker = None
+    conflict_retries: int = 3
+    conflicts: int = field(default=0, init=False, compare=False)
+
+    async def __aenter__(self):
+        start_mappers()
+        session_factory = self.session_factory or get_async_session_factory()
+        self.session = session_factory()
+        self.users = AsyncSqlAlchemyRepository(User, self.session)
+        self.articles = AsyncArticleRepository(self.session)
+        self.stats = AsyncArticleStatsRepository(self.session)
+        self.search = AsyncSearchRepository(self.session)
+        self.outbox = AsyncOutboxRepository(self.session)
+        self._recorded = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.rollback()
+        await self.session.close()
+        if isinstance(exc, StaleDataError):
+            raise ConcurrencyConflictException(str(exc)) from exc
+
+    async def commit(self):
+        await self.outbox.add_many(
+            _unrecorded_events(self._recorded, self.users, self.articles)
+        )
+        await self.session.commit()
+
+    async def rollback(self):
+        await self.session.rollback()
+        self._recorded.clear()
+
+    def collect_new_events(self):
+        return _collect_new_events(self.users, self.articles)
+
+
+def _unrecorded_events(recorded, *repositories):
+    # events stay queued for the message bus, so remember which ones already
+    # went to the outbox; holding them keeps their ids from being reused
+    events = []
+    for repository in repositories:
+        for entity in repository.seen:
+            events.extend(getattr(entity, 'events', ()))
+        events.extend(getattr(repository, 'events', ()))
+    events = [event for event in events if id(event) not in recorded]
+    recorded.update((id(event), event) for event in events)
+    return events
+
+
+def _collect_new_events(*repositories):
+    for repository in repositories:
+        for entity in repository.seen:
+            entity_events = getattr(entity, 'events', None)
+            while entity_events:
+                yield entity_events.pop(0)
+        # events raised by set-based writes that never loaded an entity
+        repository_events = getattr(repository, 'events', None)
+        while repository_events:
+            yield repository_events.pop(0)
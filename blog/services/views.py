@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from blog.domain.models import ArticleStats
+
+if TYPE_CHECKING:
+    from blog.adapters.repositories import Page
+    from blog.services.unit_of_work import BlogUnitOfWork
+
+
+def article_stats(user_id: int, uow: BlogUnitOfWork) -> ArticleStats:
+    with uow:
+        stats = uow.stats.get(user_id)
+        if stats is None:
+            return ArticleStats(user_id)
+        return ArticleStats(
+            user_id,
+            draft=stats.draft,
+            published=stats.published,
+            archived=stats.archived,
+            deleted=stats.deleted,
+        )
+
+
+def list_articles(
+    uow: BlogUnitOfWork, limit: int = 50, cursor: str = None, **filters
+) -> Page:
+    with uow:
+        return uow.articles.list_summaries(limit, cursor, **filters)
@@ -1,5 +1,8 @@
+import asyncio
+
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, clear_mappers
 
 from blog.adapters.orm import start_mappers, metadata
@@ -22,3 +25,18 @@ def session(session_factory):
     start_mappers()
     yield session_factory()
     clear_mappers()
+
+
+@pytest.fixture
+def async_session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'blog.db'}")
+
+    async def create_all():
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+
+    asyncio.run(create_all())
+    start_mappers()
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    clear_mappers()
+    asyncio.run(engine.dispose())
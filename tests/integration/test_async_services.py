@@ -0,0 +1,178 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from blog.adapters.orm import outbox
+from blog.domain import commands
+from blog.domain.exceptions import (
+    InvalidStatusException,
+    PermissionDeniedException,
+    ArticleNotFoundException,
+    UserNotFoundException,
+)
+from blog.domain.models import ArticleStatus, get_new_uuid
+from blog.services.async_handlers import (
+    create_user,
+    add_article,
+    publish_article,
+    delete_article,
+    archive_article,
+)
+from blog.services.tiering import move_cold_articles
+from blog.services.unit_of_work import AsyncBlogUnitOfWork, BlogUnitOfWork
+
+
+@pytest.fixture
+def uow(async_session_factory):
+    return AsyncBlogUnitOfWork(async_session_factory)
+
+
+async def _create_user_with_article(uow):
+    user_id = await create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    article_id = await add_article(
+        commands.AddArticle(
+            "Learning Python",
+            "article description",
+            "article content",
+            user_id,
+        ),
+        uow,
+    )
+    return user_id, article_id
+
+
+async def _get_article_status(uow, article_id):
+    async with uow:
+        article = await uow.articles.get(article_id)
+        return article.status
+
+
+def test_create_user(uow):
+    async def scenario():
+        user_id = await create_user(commands.CreateUser('Jon', 'Snow'), uow)
+        async with uow:
+            user = await uow.users.get(user_id)
+            assert user.first_name == "Jon"
+
+    asyncio.run(scenario())
+
+
+def test_raise_not_found_when_adding_article_to_non_existing_user(uow):
+    cmd = commands.AddArticle("title", "description", "content", 123)
+    with pytest.raises(UserNotFoundException):
+        asyncio.run(add_article(cmd, uow))
+
+
+def test_articles_are_read_with_their_content(uow):
+    async def scenario():
+        _, article_id = await _create_user_with_article(uow)
+        async with uow:
+            article = await uow.articles.get(article_id)
+            articles = await uow.articles.get_all()
+            return article.content, [article.content for article in articles]
+
+    assert asyncio.run(scenario()) == ("article content", ["article content"])
+
+
+def test_publish_and_archive_article(uow):
+    async def scenario():
+        user_id, article_id = await _create_user_with_article(uow)
+        await publish_article(commands.PublishArticle(article_id, user_id), uow)
+        await archive_article(commands.ArchiveArticle(article_id, user_id), uow)
+        return await _get_article_status(uow, article_id)
+
+    assert asyncio.run(scenario()) == ArticleStatus.ARCHIVED
+
+
+def test_delete_draft_article(uow):
+    async def scenario():
+        user_id, article_id = await _create_user_with_article(uow)
+        await delete_article(commands.DeleteArticle(article_id, user_id), uow)
+        return await _get_article_status(uow, article_id)
+
+    assert asyncio.run(scenario()) == ArticleStatus.DELETED
+
+
+def test_cold_articles_report_their_status(uow, tmp_path):
+    user_id, article_id = asyncio.run(_create_user_with_article(uow))
+    asyncio.run(delete_article(commands.DeleteArticle(article_id, user_id), uow))
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    assert move_cold_articles(
+        BlogUnitOfWork(sessionmaker(bind=engine)), timedelta(0), pause=0
+    ) == 1
+    engine.dispose()
+
+    assert asyncio.run(_get_article_status(uow, article_id)) == ArticleStatus.DELETED
+    with pytest.raises(InvalidStatusException):
+        asyncio.run(delete_article(commands.DeleteArticle(article_id, user_id), uow))
+
+
+def test_handlers_maintain_search_index(uow):
+    async def search(query, **kwargs):
+        async with uow:
+            return await uow.search.search(query, **kwargs)
+
+    async def scenario():
+        user_id, published = await _create_user_with_article(uow)
+        other_user_id, deleted = await _create_user_with_article(uow)
+        await publish_article(commands.PublishArticle(published, user_id), uow)
+        await delete_article(commands.DeleteArticle(deleted, other_user_id), uow)
+        return (
+            published,
+            await search("python", status=ArticleStatus.PUBLISHED),
+            await search("python"),
+        )
+
+    published, matches, everything = asyncio.run(scenario())
+    assert matches == everything == [published]
+
+
+def test_events_are_written_to_the_outbox(uow):
+    async def scenario():
+        user_id, article_id = await _create_user_with_article(uow)
+        await publish_article(commands.PublishArticle(article_id, user_id), uow)
+        async with uow:
+            result = await uow.session.execute(
+                select(outbox.c.event_type).order_by(outbox.c.id)
+            )
+            return result.scalars().all()
+
+    assert asyncio.run(scenario()) == ["ArticleAdded", "ArticlePublished"]
+
+
+def test_raise_domain_errors(uow):
+    async def scenario():
+        user_id, article_id = await _create_user_with_article(uow)
+        with pytest.raises(ArticleNotFoundException):
+            await publish_article(
+                commands.PublishArticle(get_new_uuid(), user_id), uow
+            )
+        with pytest.raises(ArticleNotFoundException):
+            await publish_article(commands.PublishArticle("invalid", user_id), uow)
+        with pytest.raises(PermissionDeniedException):
+            await publish_article(commands.PublishArticle(article_id, 123), uow)
+        with pytest.raises(InvalidStatusException):
+            await archive_article(
+                commands.ArchiveArticle(article_id, user_id), uow
+            )
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_commands(async_session_factory):
+    async def scenario():
+        user_id = await create_user(
+            commands.CreateUser('Jon', 'Snow'),
+            AsyncBlogUnitOfWork(async_session_factory),
+        )
+        cmd = commands.AddArticle("title", "description", "content", user_id)
+        return await asyncio.gather(*(
+            add_article(cmd, AsyncBlogUnitOfWork(async_session_factory))
+            for _ in range(10)
+        ))
+
+    article_ids = asyncio.run(scenario())
+    assert len(set(article_ids)) == 10
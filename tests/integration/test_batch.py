@@ -0,0 +1,99 @@
+import pytest
+
+from blog.adapters.repositories import SqlAlchemyRepository
+from blog.domain import commands
+from blog.domain.exceptions import (
+    InvalidStatusException,
+    PermissionDeniedException,
+    ArticleNotFoundException,
+    UserNotFoundException,
+)
+from blog.domain.models import Article, ArticleStatus, get_new_uuid
+from blog.services.batch import execute_batch
+from blog.services.handlers import create_user, add_article
+from blog.services.unit_of_work import BlogUnitOfWork
+
+
+@pytest.fixture
+def uow(session_factory):
+    return BlogUnitOfWork(session_factory)
+
+
+@pytest.fixture
+def article_repository(session):
+    return SqlAlchemyRepository(Article, session)
+
+
+@pytest.fixture
+def user_id(uow, session):
+    return create_user(commands.CreateUser('Jon', 'Snow'), uow)
+
+
+def _add_article_cmd(user_id):
+    return commands.AddArticle(
+        "Learning Python",
+        "article description",
+        "article content",
+        user_id,
+    )
+
+
+def test_batch_creates_users_and_articles(uow, article_repository, user_id):
+    result = execute_batch(
+        [
+            commands.CreateUser('Arya', 'Stark'),
+            _add_article_cmd(user_id),
+            _add_article_cmd(user_id),
+        ],
+        uow,
+    )
+
+    assert not result.errors
+    assert result.succeeded == 3
+    assert result.results[0]
+    assert article_repository.get(result.results[1]).user_id == user_id
+    assert article_repository.get_all().count() == 2
+
+
+def test_batch_applies_transitions_in_order(uow, article_repository, user_id):
+    article_id = add_article(_add_article_cmd(user_id), uow)
+
+    result = execute_batch(
+        [
+            commands.PublishArticle(article_id, user_id),
+            commands.ArchiveArticle(article_id, user_id),
+        ],
+        uow,
+    )
+
+    assert not result.errors
+    article = article_repository.get(article_id)
+    assert article.status == ArticleStatus.ARCHIVED
+
+
+def test_batch_reports_failures_per_command(uow, article_repository, user_id):
+    published_id = add_article(_add_article_cmd(user_id), uow)
+    draft_id = add_article(_add_article_cmd(user_id), uow)
+
+    result = execute_batch(
+        [
+            commands.PublishArticle(published_id, user_id),
+            commands.ArchiveArticle(draft_id, user_id),
+            commands.PublishArticle(get_new_uuid(), user_id),
+            commands.DeleteArticle(draft_id, 123),
+            _add_article_cmd(123),
+            commands.DeleteArticle(draft_id, user_id),
+            commands.PublishArticle("invalid", user_id),
+        ],
+        uow,
+        chunk_size=4,
+    )
+
+    assert result.failed == 5
+    assert isinstance(result.errors[1], InvalidStatusException)
+    assert isinstance(result.errors[2], ArticleNotFoundException)
+    assert isinstance(result.errors[3], PermissionDeniedException)
+    assert isinstance(result.errors[4], UserNotFoundException)
+    assert isinstance(result.errors[6], ArticleNotFoundException)
+    assert article_repository.get(published_id).status == ArticleStatus.PUBLISHED
+    assert article_repository.get(draft_id).status == ArticleStatus.DELETED
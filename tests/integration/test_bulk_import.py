@@ -0,0 +1,100 @@
+import json
+
+import pytest
+
+from blog.domain import commands
+from blog.domain.exceptions import UserNotFoundException
+from blog.domain.models import ArticleStats
+from blog.services.bulk_import import import_file, import_records
+from blog.services.handlers import create_user
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import article_stats
+
+
+@pytest.fixture
+def uow(session_factory, session):
+    return BlogUnitOfWork(session_factory)
+
+
+@pytest.fixture
+def user_id(uow):
+    return create_user(commands.CreateUser('Jon', 'Snow'), uow)
+
+
+def _article(user_id, title="Python"):
+    return {
+        "type": "article", "title": title, "description": "d",
+        "content": "c", "user_id": user_id,
+    }
+
+
+def _count_articles(uow):
+    with uow:
+        return uow.articles.get_all().count()
+
+
+def test_imports_users_and_articles_in_chunks(uow, user_id):
+    records = [{"type": "user", "first_name": "Arya", "last_name": "Stark"}] + [
+        _article(user_id) for _ in range(4)
+    ] + [{"type": "user", "first_name": "Bran"}, _article(user_id + 100)]
+
+    result = import_records(records, uow, "backfill", chunk_size=2)
+
+    assert result.imported == 5
+    assert result.position == 7
+    assert set(result.errors) == {5, 6}
+    assert isinstance(result.errors[6], UserNotFoundException)
+    assert result.rows_per_second > 0
+    with uow:
+        assert uow.users.get_all().count() == 2
+        assert uow.checkpoints.get("backfill") == 7
+        assert len(uow.search.search("python")) == 4
+    assert article_stats(user_id, uow) == ArticleStats(user_id, draft=4)
+
+
+def test_import_resumes_after_the_last_committed_chunk(uow, user_id):
+    records = [_article(user_id, f"title {i}") for i in range(5)]
+
+    def crash_after(count):
+        for record in records[:count]:
+            yield record
+        raise RuntimeError("worker killed")
+
+    with pytest.raises(RuntimeError):
+        import_records(crash_after(3), uow, "backfill", chunk_size=2)
+    assert _count_articles(uow) == 2
+
+    result = import_records(records, uow, "backfill", chunk_size=2)
+
+    assert (result.imported, result.position) == (3, 5)
+    assert _count_articles(uow) == 5
+    assert import_records(records, uow, "backfill").imported == 0
+
+
+def test_import_file_reads_ndjson_and_csv(uow, user_id, tmp_path):
+    ndjson = tmp_path / "articles.ndjson"
+    ndjson.write_text("".join(json.dumps(_article(user_id)) + "\n" for _ in range(3)))
+    csv = tmp_path / "users.csv"
+    csv.write_text("first_name,last_name\nArya,Stark\nBran,Stark\n")
+
+    assert import_file(str(ndjson), uow).imported == 3
+    assert import_file(str(csv), uow, record_type="user").imported == 2
+    assert _count_articles(uow) == 3
+
+
+def test_corrupt_ndjson_line_is_reported_and_skipped(uow, user_id, tmp_path):
+    path = tmp_path / "users.ndjson"
+    path.write_text(
+        '{"type": "user", "first_name": "Arya", "last_name": "Stark"}\n'
+        '{bad json\n'
+        '{"type": "user", "first_name": "Bran", "last_name": "Stark"}\n'
+    )
+
+    result = import_file(str(path), uow, chunk_size=3)
+
+    assert (result.imported, result.position) == (2, 3)
+    assert set(result.errors) == {1}
+    assert isinstance(result.errors[1], ValueError)
+    with uow:
+        assert uow.users.get_all().count() == 3
+        assert uow.checkpoints.get("users.ndjson") == 3
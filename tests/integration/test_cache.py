@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import event
+
+from blog.adapters.cache import EntityCache
+from blog.domain import commands
+from blog.domain.models import Article, ArticleStats, ArticleStatus
+from blog.services.batch import execute_batch
+from blog.services.handlers import (
+    create_user,
+    add_article,
+    publish_article,
+    rebuild_article_stats,
+)
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import article_stats
+
+
+@pytest.fixture
+def cache():
+    return EntityCache()
+
+
+@pytest.fixture
+def uow(session_factory, cache):
+    return BlogUnitOfWork(session_factory, cache=cache)
+
+
+@pytest.fixture
+def article_ids(uow, session):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    cmd = commands.AddArticle("title", "description", "content", user_id)
+    return user_id, add_article(cmd, uow), add_article(cmd, uow)
+
+
+def _get_status(uow, article_id):
+    with uow:
+        return uow.articles.get(article_id).status
+
+
+def test_get_is_served_from_cache_after_first_load(uow, cache, article_ids, in_memory_db):
+    _, article_id, _ = article_ids
+    _get_status(uow, article_id)
+
+    statements = []
+    event.listen(in_memory_db, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert _get_status(uow, article_id) == ArticleStatus.DRAFT
+
+    assert not [s for s in statements if s.startswith("SELECT")]
+    assert cache.hits == 1
+
+
+def test_commit_evicts_only_written_entities(uow, cache, article_ids):
+    user_id, published_id, untouched_id = article_ids
+    _get_status(uow, published_id)
+    _get_status(uow, untouched_id)
+
+    publish_article(commands.PublishArticle(published_id, user_id), uow)
+
+    hits, misses = cache.hits, cache.misses
+    assert _get_status(uow, published_id) == ArticleStatus.PUBLISHED
+    assert _get_status(uow, untouched_id) == ArticleStatus.DRAFT
+    assert (cache.hits, cache.misses) == (hits + 1, misses + 1)
+
+
+def test_set_based_updates_evict_on_commit(uow, cache, article_ids):
+    user_id, article_id, _ = article_ids
+    _get_status(uow, article_id)
+
+    execute_batch([commands.PublishArticle(article_id, user_id)], uow)
+
+    assert _get_status(uow, article_id) == ArticleStatus.PUBLISHED
+
+
+def test_rollback_discards_flushed_changes(uow, cache, article_ids):
+    _, article_id, _ = article_ids
+    with uow:
+        uow.articles.get(article_id).publish()
+        uow.session.flush()
+
+    assert _get_status(uow, article_id) == ArticleStatus.DRAFT
+
+
+def test_rollback_evicts_uncommitted_reads(uow, cache, article_ids):
+    user_id, article_id, _ = article_ids
+    with uow:
+        uow.articles.transition(
+            [article_id], user_id, ArticleStatus.DRAFT, ArticleStatus.PUBLISHED
+        )
+        assert uow.articles.get(article_id).status == ArticleStatus.PUBLISHED
+
+    assert _get_status(uow, article_id) == ArticleStatus.DRAFT
+
+
+
+def test_stats_rebuild_evicts_only_stats(uow, cache, article_ids, session):
+    user_id, article_id, _ = article_ids
+    _get_status(uow, article_id)
+    article_stats(user_id, uow)
+    # written behind the stats table's back, so only a rebuild counts it
+    session.add(Article("title", "description", "content", user_id=user_id))
+    session.commit()
+
+    rebuild_article_stats(commands.RebuildArticleStats(), uow)
+
+    hits = cache.hits
+    assert _get_status(uow, article_id) == ArticleStatus.DRAFT
+    assert cache.hits == hits + 1
+    assert article_stats(user_id, uow) == ArticleStats(user_id, draft=3)
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from blog.adapters.orm import metadata
+from blog.domain import commands
+from blog.domain.exceptions import ArticleNotFoundException
+from blog.domain.models import ArticleStats, get_new_uuid
+from blog.services.executor import CommandExecutor
+from blog.services.handlers import create_user, add_article
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import article_stats
+
+
+@pytest.fixture
+def uow(tmp_path, session):
+    # a file database, so every worker thread sees the same data
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    metadata.create_all(engine)
+    yield BlogUnitOfWork(sessionmaker(bind=engine))
+    engine.dispose()
+
+
+def _users_with_articles(uow, users, articles):
+    owned = {}
+    for _ in range(users):
+        user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+        owned[user_id] = [
+            add_article(commands.AddArticle("title", "description", "content", user_id), uow)
+            for _ in range(articles)
+        ]
+    return owned
+
+
+def test_commands_for_one_aggregate_run_in_order(uow):
+    owned = _users_with_articles(uow, users=4, articles=5)
+    cmds = []
+    for user_id, article_ids in owned.items():
+        for article_id in article_ids:
+            # archive only succeeds if it runs after the publish before it
+            cmds.append(commands.PublishArticle(article_id, user_id))
+            cmds.append(commands.ArchiveArticle(article_id, user_id))
+
+    with CommandExecutor(uow, workers=4) as executor:
+        outcomes = executor.execute(cmds)
+
+    assert [outcome.command for outcome in outcomes] == cmds
+    assert all(outcome.ok for outcome in outcomes)
+    for user_id in owned:
+        assert article_stats(user_id, uow) == ArticleStats(user_id, archived=5)
+
+
+def test_outcomes_carry_results_and_errors_per_command(uow):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    missing = get_new_uuid()
+
+    with CommandExecutor(uow, workers=2) as executor:
+        created, failed, added = executor.execute([
+            commands.CreateUser('Arya', 'Stark'),
+            commands.PublishArticle(missing, user_id),
+            commands.AddArticle("title", "description", "content", user_id),
+        ])
+
+    assert created.ok and isinstance(created.result, int)
+    assert isinstance(failed.error, ArticleNotFoundException)
+    assert added.ok and added.result
+
+
+def test_same_key_always_maps_to_the_same_lane(uow):
+    with CommandExecutor(uow, workers=8) as executor:
+        lanes = {
+            executor.lane(commands.PublishArticle(get_new_uuid(), 42))
+            for _ in range(20)
+        }
+    assert len(lanes) == 1
+    with pytest.raises(ValueError):
+        CommandExecutor(uow, workers=0)
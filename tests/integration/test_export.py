@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from blog.domain.models import User, Article, ArticleStatus
+from blog.services.export import export_articles, EXPORT_COLUMNS
+from blog.services.unit_of_work import BlogUnitOfWork
+
+
+@pytest.fixture
+def uow(session_factory):
+    return BlogUnitOfWork(session_factory)
+
+
+@pytest.fixture
+def articles(session):
+    session.add_all([User('Jon', 'Snow'), User('Arya', 'Stark')])
+    start = datetime(2022, 1, 1)
+    articles = [
+        Article(
+            f"title {i}",
+            "description",
+            f"content {i}",
+            status=ArticleStatus.PUBLISHED if i % 2 else ArticleStatus.DRAFT,
+            updated_at=start + timedelta(days=i),
+            user_id=1 + i % 3 // 2,
+        )
+        for i in range(7)
+    ]
+    session.add_all(articles)
+    session.commit()
+    return articles
+
+
+def _export(uow, **kwargs):
+    out = io.StringIO()
+    count = export_articles(out, uow, chunk_size=2, **kwargs)
+    return count, out.getvalue()
+
+
+def test_exports_every_article_as_ndjson(uow, articles):
+    count, text = _export(uow)
+
+    rows = [json.loads(line) for line in text.splitlines()]
+    assert count == len(rows) == len(articles)
+    first = next(row for row in rows if row["id"] == articles[0].id)
+    assert first == {
+        "id": articles[0].id,
+        "title": "title 0",
+        "description": "description",
+        "content": "content 0",
+        "status": ArticleStatus.DRAFT,
+        "user_id": 1,
+        "created_at": articles[0].created_at.isoformat(),
+        "updated_at": "2022-01-01T00:00:00",
+    }
+
+
+def test_exports_csv_with_header(uow, articles):
+    count, text = _export(uow, format="csv")
+
+    rows = list(csv.reader(io.StringIO(text)))
+    assert rows[0] == list(EXPORT_COLUMNS)
+    assert count == len(rows) - 1 == len(articles)
+
+
+def test_filters_narrow_the_export(uow, articles):
+    count, text = _export(
+        uow,
+        user_id=1,
+        status=ArticleStatus.PUBLISHED,
+        updated_since=datetime(2022, 1, 3),
+    )
+
+    expected = {
+        article.id for article in articles
+        if article.user_id == 1
+        and article.status == ArticleStatus.PUBLISHED
+        and article.updated_at >= datetime(2022, 1, 3)
+    }
+    assert expected
+    assert {json.loads(line)["id"] for line in text.splitlines()} == expected
+    assert count == len(expected)
+
+
+def test_export_keeps_nothing_in_the_identity_map(uow, articles, monkeypatch):
+    sizes = []
+    original = uow.__class__.__exit__
+
+    def record(self, *args):
+        sizes.append(len(self.session.identity_map))
+        return original(self, *args)
+
+    monkeypatch.setattr(uow.__class__, "__exit__", record)
+    _export(uow)
+    assert sizes == [0]
+
+
+def test_rejects_unknown_format(uow):
+    with pytest.raises(ValueError):
+        _export(uow, format="xml")
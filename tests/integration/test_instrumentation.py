@@ -0,0 +1,66 @@
+import pytest
+
+from blog.adapters.instrumentation import Instrumentation, command_label
+from blog.domain import commands
+from blog.services.message_bus import bootstrap
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import list_articles
+
+
+@pytest.fixture
+def instrumentation():
+    return Instrumentation()
+
+
+@pytest.fixture
+def bus(session_factory, instrumentation, session):
+    return bootstrap(BlogUnitOfWork(session_factory, instrumentation=instrumentation))
+
+
+def test_records_phases_and_sql_per_command(bus, instrumentation):
+    user_id = bus.handle(commands.CreateUser('Jon', 'Snow'))
+    article_id = bus.handle(
+        commands.AddArticle("title", "description", "content", user_id)
+    )
+    bus.handle(commands.PublishArticle(article_id, user_id))
+
+    exported = instrumentation.export()
+    assert set(exported) == {"CreateUser", "AddArticle", "PublishArticle"}
+
+    publish = exported["PublishArticle"]
+    for phase in ("enter", "sql", "commit", "total"):
+        assert publish[f"{phase}_seconds"]["count"] == 1
+    # the guarded transition writes without loading or flushing the article
+    assert "flush_seconds" not in publish
+    assert exported["AddArticle"]["flush_seconds"]["count"] == 1
+    # article UPDATE, stats upsert, search postings UPDATE, outbox INSERT
+    assert publish["statements"]["sum"] == 4
+    assert publish["rows_fetched"]["sum"] == 0
+    # one row each for the article, stats and outbox, one per posting (3 terms)
+    assert publish["rows_written"]["sum"] == 6
+
+
+def test_counts_rows_fetched_by_orm_and_core_reads(session_factory, instrumentation, session):
+    uow = BlogUnitOfWork(session_factory, instrumentation=instrumentation)
+    bus = bootstrap(uow)
+    user_id = bus.handle(commands.CreateUser('Jon', 'Snow'))
+    for _ in range(10):
+        bus.handle(commands.AddArticle("title", "description", "content", user_id))
+
+    with command_label("ListSummaries"):
+        assert len(list_articles(uow).items) == 10
+    with command_label("List"):
+        with uow:
+            assert len(uow.articles.list().items) == 10
+
+    exported = instrumentation.export()
+    assert exported["ListSummaries"]["rows_fetched"]["sum"] == 10
+    assert exported["List"]["rows_fetched"]["sum"] == 10
+
+
+def test_sql_outside_instrumented_units_of_work_is_ignored(
+    bus, instrumentation, session
+):
+    bus.handle(commands.CreateUser('Jon', 'Snow'))
+    session.execute("SELECT 1")
+    assert instrumentation.export()["CreateUser"]["statements"]["count"] == 1
@@ -1,6 +1,10 @@
-from sqlalchemy.orm import Session
+import sys
+import threading
 
-from blog.domain.models import User, Article, get_new_uuid
+from sqlalchemy.orm import Session, clear_mappers
+
+from blog.adapters.orm import start_mappers
+from blog.domain.models import User, Article, ArticleStatus, get_new_uuid
 
 
 def _create_user(session: Session, first_name: str, last_name: str):
@@ -39,3 +43,37 @@ def test_can_retrieve_articles(session):
     article = articles_query.first()
     assert article.title == 'Learning Python'
     assert article.user_id == user.id
+
+
+def test_loaded_status_is_the_shared_constant(session):
+    _create_user(session, 'Jon', 'Snow')
+    _create_article(session, 'title', 'description', 'content', 1)
+    article = session.query(Article).first()
+    assert article.status is ArticleStatus.DRAFT
+
+
+def test_start_mappers_is_safe_to_race():
+    clear_mappers()
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def start():
+        barrier.wait()
+        try:
+            start_mappers()
+        except Exception as error:
+            errors.append(error)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=start) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+        clear_mappers()
+
+    assert errors == []
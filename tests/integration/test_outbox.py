@@ -0,0 +1,146 @@
+import json
+import time
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from blog.adapters.orm import metadata, outbox
+from blog.adapters.outbox import FileSink, QueueSink
+from blog.domain import commands
+from blog.domain.exceptions import InvalidStatusException
+from blog.services.batch import execute_batch
+from blog.services.bulk_import import import_records
+from blog.services.handlers import create_user, add_article, publish_article
+from blog.services.outbox_relay import OutboxRelay
+from blog.services.unit_of_work import BlogUnitOfWork
+
+
+@pytest.fixture
+def uow(session_factory, session):
+    return BlogUnitOfWork(session_factory)
+
+
+def _publish_new_article(uow):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    article_id = add_article(
+        commands.AddArticle("title", "description", "content", user_id), uow
+    )
+    publish_article(commands.PublishArticle(article_id, user_id), uow)
+    return user_id, article_id
+
+
+def _outbox_rows(session):
+    return session.execute(
+        select(outbox.c.event_type, outbox.c.payload, outbox.c.delivered_at)
+        .order_by(outbox.c.id)
+    ).all()
+
+
+def test_events_are_written_with_the_change(uow, session):
+    user_id, article_id = _publish_new_article(uow)
+    with pytest.raises(InvalidStatusException):
+        publish_article(commands.PublishArticle(article_id, user_id), uow)
+
+    payload = {"article_id": article_id, "user_id": user_id}
+    assert _outbox_rows(session) == [
+        ("ArticleAdded", payload, None),
+        ("ArticlePublished", payload, None),
+    ]
+
+
+def test_batch_writes_events_for_applied_commands(uow, session):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    article_id = add_article(
+        commands.AddArticle("title", "description", "content", user_id), uow
+    )
+
+    result = execute_batch(
+        [
+            commands.AddArticle("title", "description", "content", user_id),
+            commands.PublishArticle(article_id, user_id),
+            commands.ArchiveArticle(article_id, 123),
+        ],
+        uow,
+    )
+
+    new_id = result.results[0]
+    assert [row[:2] for row in _outbox_rows(session)] == [
+        ("ArticleAdded", {"article_id": article_id, "user_id": user_id}),
+        ("ArticleAdded", {"article_id": new_id, "user_id": user_id}),
+        ("ArticlePublished", {"article_id": article_id, "user_id": user_id}),
+    ]
+
+
+def test_bulk_import_writes_article_added_events(uow, session):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    records = [
+        {
+            "type": "article", "title": "title", "description": "d",
+            "content": "c", "user_id": user_id,
+        }
+        for _ in range(3)
+    ]
+
+    import_records(records, uow, "backfill", chunk_size=2)
+
+    with uow:
+        article_ids = {article.id for article in uow.articles.get_all()}
+    rows = _outbox_rows(session)
+    assert [row.event_type for row in rows] == ["ArticleAdded"] * 3
+    assert {row.payload["article_id"] for row in rows} == article_ids
+
+
+def test_relay_delivers_batches_in_order(uow, session):
+    _publish_new_article(uow)
+    _publish_new_article(uow)
+    sink = QueueSink()
+    relay = OutboxRelay(uow, sink, batch_size=3)
+
+    assert relay.run_once() == 3
+    assert relay.run_once() == 1
+    assert relay.run_once() == 0
+
+    messages = [sink.messages.get_nowait() for _ in range(4)]
+    assert [message.event_type for message in messages] == [
+        "ArticleAdded", "ArticlePublished", "ArticleAdded", "ArticlePublished",
+    ]
+    assert all(row.delivered_at for row in _outbox_rows(session))
+    stats = relay.stats()
+    assert stats["delivered"] == 4
+    assert stats["lag_seconds"]["count"] == 4
+
+
+def test_failed_delivery_stays_pending(uow, session):
+    _publish_new_article(uow)
+
+    class BrokenSink:
+        def send(self, messages):
+            raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        OutboxRelay(uow, BrokenSink()).run_once()
+    assert not any(row.delivered_at for row in _outbox_rows(session))
+
+    assert OutboxRelay(uow, QueueSink()).run_once() == 2
+
+
+def test_background_relay_appends_to_a_file(tmp_path, session):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    metadata.create_all(engine)
+    uow = BlogUnitOfWork(sessionmaker(bind=engine))
+    path = tmp_path / "events.ndjson"
+    relay = OutboxRelay(uow, FileSink(str(path)), interval=0.01)
+
+    relay.start()
+    try:
+        _, article_id = _publish_new_article(uow)
+        deadline = time.monotonic() + 5
+        while relay.delivered < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        relay.stop()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["event_type"] for line in lines] == ["ArticleAdded", "ArticlePublished"]
+    assert lines[1]["payload"]["article_id"] == article_id
@@ -0,0 +1,154 @@
+import io
+import shutil
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from blog.adapters.cache import EntityCache
+from blog.adapters.orm import metadata, users
+from blog.adapters.routing import RoutingSession, WriteClock
+from blog.domain import commands
+from blog.domain.models import ArticleStats, ArticleStatus, User
+from blog.services.export import export_articles
+from blog.services.handlers import add_article, create_user, publish_article
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import article_stats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _engine(path):
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def primary(tmp_path):
+    engine = _engine(tmp_path / 'primary.db')
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replicas(tmp_path):
+    # left empty, so anything read from them is visibly not the primary's data
+    engines = [_engine(tmp_path / f'replica{i}.db') for i in range(2)]
+    yield engines
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def uow(primary, replicas, session):
+    return BlogUnitOfWork(
+        sessionmaker(bind=primary, class_=RoutingSession), replicas=replicas[:1]
+    )
+
+
+def _user_with_article(uow):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    add_article(commands.AddArticle("title", "description", "content", user_id), uow)
+    return user_id
+
+
+def _user_count(uow):
+    return uow.session.execute(select(func.count()).select_from(users)).scalar()
+
+
+def test_read_only_units_of_work_read_from_a_replica(uow):
+    user_id = _user_with_article(uow)
+
+    assert article_stats(user_id, uow) == ArticleStats(user_id, draft=1)
+    assert article_stats(user_id, uow.reader()) == ArticleStats(user_id)
+
+
+def test_reads_after_a_write_go_to_the_primary(uow, primary, replicas):
+    _user_with_article(uow)
+
+    with uow.reader() as reader:
+        assert _user_count(reader) == 0
+        reader.users.add(User('Arya', 'Stark'))
+        reader.session.flush()
+        assert _user_count(reader) == 2
+        reader.commit()
+
+    with primary.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(users)).scalar() == 2
+    with replicas[0].connect() as connection:
+        assert connection.execute(select(func.count()).select_from(users)).scalar() == 0
+
+
+def test_readers_stay_on_the_primary_just_after_a_commit(uow):
+    clock = FakeClock()
+    uow.write_clock = WriteClock(clock)
+    uow.read_your_writes_seconds = 5.0
+    user_id = _user_with_article(uow)
+
+    assert article_stats(user_id, uow.reader()) == ArticleStats(user_id, draft=1)
+    clock.now += 5.0
+    assert article_stats(user_id, uow.reader()) == ArticleStats(user_id)
+
+
+def test_unfiltered_exports_read_from_a_replica(uow):
+    _user_with_article(uow)
+
+    with uow.reader() as reader:
+        # the unfiltered stream unions the hot and cold tables
+        assert list(reader.articles.stream(("id",))) == []
+        assert not reader.session.info.get('wrote')
+    assert export_articles(io.StringIO(), uow.reader()) == 0
+    assert export_articles(io.StringIO(), uow) == 1
+
+
+def test_replicas_are_chosen_round_robin(uow, replicas):
+    uow.replicas = replicas
+    chosen = []
+    for _ in range(3):
+        with uow.reader() as reader:
+            chosen.append(reader.session.info['replica'])
+    assert chosen == [replicas[0], replicas[1], replicas[0]]
+
+
+def test_without_replicas_readers_use_the_primary(uow):
+    uow.replicas = []
+    user_id = _user_with_article(uow)
+
+    with uow.reader() as reader:
+        assert 'replica' not in reader.session.info
+    assert article_stats(user_id, uow.reader()) == ArticleStats(user_id, draft=1)
+
+
+def test_replica_reads_need_a_routing_session(primary, replicas, session):
+    uow = BlogUnitOfWork(sessionmaker(bind=primary), replicas=replicas)
+    with pytest.raises(TypeError):
+        with uow.reader():
+            pass
+
+
+def test_replica_reads_do_not_fill_the_shared_cache(tmp_path, primary, session):
+    uow = BlogUnitOfWork(
+        sessionmaker(bind=primary, class_=RoutingSession), cache=EntityCache()
+    )
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    article_id = add_article(
+        commands.AddArticle("title", "description", "content", user_id), uow
+    )
+    # a snapshot taken before the publish below, standing in for a lagging replica
+    shutil.copy(tmp_path / 'primary.db', tmp_path / 'lagging.db')
+    lagging = create_engine(f"sqlite:///{tmp_path / 'lagging.db'}")
+    uow.replicas = [lagging]
+    publish_article(commands.PublishArticle(article_id, user_id), uow)
+
+    with uow.reader() as reader:
+        assert reader.articles.get(article_id).status == ArticleStatus.DRAFT
+    with uow:
+        assert uow.articles.get(article_id).status == ArticleStatus.PUBLISHED
+    lagging.dispose()
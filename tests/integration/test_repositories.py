@@ -1,5 +1,15 @@
-from blog.adapters.repositories import SqlAlchemyRepository
-from blog.domain.models import User, Article
+from datetime import datetime, timedelta
+
+import pytest
+
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import instance_state
+
+from blog.adapters.cache import EntityCache
+from blog.adapters.repositories import SqlAlchemyRepository, ArticleRepository
+from blog.domain.models import (
+    User, Article, ArticleStatus, ArticleSummary, get_new_uuid,
+)
 
 
 def test_add_and_retrieve_users(session):
@@ -34,3 +44,149 @@ def test_add_and_retrieve_user_articles(session):
 
     user = user_repository.get_all().first()
     assert article in user.articles
+
+
+@pytest.fixture
+def article_repository(session):
+    return SqlAlchemyRepository(Article, session, order_by=('created_at', 'id'))
+
+
+def _add_articles(session, count, user_id=1, status=ArticleStatus.DRAFT):
+    created_at = datetime(2022, 1, 1)
+    articles = [
+        Article(
+            f"title {i}",
+            "description",
+            "content",
+            status=status,
+            created_at=created_at + timedelta(minutes=i // 2),
+            user_id=user_id,
+        )
+        for i in range(count)
+    ]
+    session.add_all(articles)
+    session.commit()
+    return sorted(articles, key=lambda article: (article.created_at, article.id))
+
+
+def test_get_all_pages_in_sql(session, article_repository):
+    session.add(User('Jon', 'Snow'))
+    expected = _add_articles(session, 5)
+    statements = []
+    event.listen(
+        session.get_bind(), "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    query = article_repository.get_all().order_by(Article.created_at, Article.id)
+    assert statements == []
+    assert query.offset(3).limit(2).all() == expected[3:]
+    assert "LIMIT" in statements[0] and "OFFSET" in statements[0]
+
+
+def test_list_pages_through_articles_with_cursor(session, article_repository):
+    session.add(User('Jon', 'Snow'))
+    expected = [article.id for article in _add_articles(session, 7)]
+
+    seen, cursor = [], None
+    while True:
+        page = article_repository.list(limit=3, cursor=cursor)
+        seen.extend(article.id for article in page.items)
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    assert seen == expected
+
+
+def test_list_filters_by_user_and_status(session, article_repository):
+    session.add_all([User('Jon', 'Snow'), User('Arya', 'Stark')])
+    _add_articles(session, 3, user_id=1)
+    published = _add_articles(session, 2, user_id=2, status=ArticleStatus.PUBLISHED)
+    _add_articles(session, 2, user_id=2)
+
+    page = article_repository.list(user_id=2, status=ArticleStatus.PUBLISHED)
+
+    assert [article.id for article in page.items] == [a.id for a in published]
+    assert page.next_cursor is None
+
+
+def test_list_rejects_invalid_cursor(article_repository):
+    with pytest.raises(ValueError):
+        article_repository.list(cursor="not-a-cursor")
+
+
+def test_reads_leave_content_unloaded_until_accessed(session, article_repository):
+    session.add(User('Jon', 'Snow'))
+    article_id = _add_articles(session, 1)[0].id
+    session.expunge_all()
+
+    article, = article_repository.list().items
+    assert "content" in instance_state(article).unloaded
+    assert article.content == "content"
+
+    session.expunge_all()
+    article = article_repository.get(article_id)
+    assert "content" in instance_state(article).unloaded
+
+
+def test_get_uses_the_identity_map_before_querying(session, article_repository):
+    session.add(User('Jon', 'Snow'))
+    article = _add_articles(session, 1)[0]
+    statements = []
+    event.listen(
+        session.get_bind(), "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    assert article_repository.get(article.id) is article
+    assert statements == []
+    assert article_repository.exists(article.id)
+    assert not article_repository.exists(get_new_uuid())
+    assert len(statements) == 2
+
+
+def test_malformed_article_ids_match_nothing(session):
+    article_repository = ArticleRepository(session)
+    statements = []
+    event.listen(
+        session.get_bind(), "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    assert article_repository.get("invalid") is None
+    assert not article_repository.exists("invalid")
+    assert article_repository.get_summary("invalid") is None
+    assert article_repository.get_values(["invalid"], "id") == []
+    assert statements == []
+
+
+def test_cached_articles_keep_content_deferred(session):
+    session.add(User('Jon', 'Snow'))
+    article_id = _add_articles(session, 1)[0].id
+    repository = ArticleRepository(session, cache=EntityCache())
+    session.expunge_all()
+    repository.get(article_id)
+    session.expunge_all()
+
+    article = repository.get(article_id)
+    assert repository.cache.hits == 1
+    assert "content" in instance_state(article).unloaded
+    assert article.content == "content"
+
+
+def test_list_summaries_pages_without_loading_entities(session):
+    session.add(User('Jon', 'Snow'))
+    expected = _add_articles(session, 5)
+    repository = ArticleRepository(session, order_by=('created_at', 'id'))
+    session.expunge_all()
+
+    first = repository.list_summaries(limit=3, user_id=1)
+    second = repository.list_summaries(limit=3, cursor=first.next_cursor, user_id=1)
+
+    summaries = first.items + second.items
+    assert [summary.id for summary in summaries] == [a.id for a in expected]
+    assert all(type(summary) is ArticleSummary for summary in summaries)
+    assert second.next_cursor is None
+    assert len(session.identity_map) == 0
+    assert repository.get_summary(expected[0].id) == summaries[0]
@@ -0,0 +1,146 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, select
+
+from blog.adapters.orm import articles
+from blog.adapters.repositories import SqlAlchemyRepository
+from blog.adapters.schema import (
+    upgrade_schema,
+    full_scans,
+    query_plan,
+    migrate_article_ids,
+)
+from blog.domain.models import Article, ArticleStatus, get_new_uuid
+from blog.services.unit_of_work import ARTICLES_ORDER_BY
+
+
+@pytest.fixture
+def article_repository(session):
+    return SqlAlchemyRepository(Article, session, order_by=ARTICLES_ORDER_BY)
+
+
+def _cursor(repository):
+    article = Article("title", "description", "content", created_at=datetime(2022, 1, 1))
+    return repository._encode_cursor(article)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"user_id": 1},
+    {"status": ArticleStatus.PUBLISHED},
+    {"user_id": 1, "status": ArticleStatus.DRAFT},
+])
+@pytest.mark.parametrize("first_page", [True, False])
+def test_listing_queries_use_an_index(
+    session, article_repository, in_memory_db, filters, first_page
+):
+    cursor = None if first_page else _cursor(article_repository)
+    statement = article_repository.list_statement(51, cursor, **filters)
+    with in_memory_db.connect() as connection:
+        assert full_scans(connection, statement) == []
+
+
+def test_next_page_seeks_into_the_index(session, article_repository, in_memory_db):
+    statement = article_repository.list_statement(
+        51, _cursor(article_repository), user_id=1
+    )
+    with in_memory_db.connect() as connection:
+        plan = query_plan(connection, statement)
+    assert any(
+        line.startswith("SEARCH") and "created_at" in line for line in plan
+    )
+
+
+def test_get_by_id_uses_primary_key(session, in_memory_db):
+    statement = select(articles).where(articles.c.id == "article-id")
+    with in_memory_db.connect() as connection:
+        assert full_scans(connection, statement) == []
+
+
+def test_upgrade_schema_adds_missing_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    with engine.begin() as connection:
+        articles.create(connection)
+        connection.exec_driver_sql("DROP INDEX ix_articles_user_id_created_at_id")
+
+    upgrade_schema(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("articles")}
+    assert {index.name for index in articles.indexes} <= indexes
+
+
+def test_upgrade_schema_adds_version_column_to_existing_rows(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE articles (id BLOB PRIMARY KEY, title VARCHAR, "
+            "description VARCHAR, content VARCHAR, status VARCHAR, "
+            "user_id INTEGER, created_at DATETIME, updated_at DATETIME)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO articles (id, title, description, content, status, user_id) "
+            "VALUES (x'00', 'title', 'description', 'content', 'draft', 1)"
+        )
+
+    upgrade_schema(engine)
+
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT version FROM articles").scalar() == 1
+
+
+def test_migrate_article_ids_converts_legacy_text_ids(session, in_memory_db):
+    legacy_ids = sorted(str(uuid.uuid1()) for _ in range(5))
+    for article_id in legacy_ids:
+        session.execute(
+            "INSERT INTO articles (id, title, description, content, status, user_id) "
+            f"VALUES ('{article_id}', 'title', 'description', 'content', 'draft', 1)"
+        )
+    session.commit()
+    repository = SqlAlchemyRepository(Article, session)
+    assert repository.get(legacy_ids[0]) is None
+
+    assert migrate_article_ids(in_memory_db, batch_size=2) == 5
+    assert migrate_article_ids(in_memory_db) == 0
+
+    session.expire_all()
+    assert [repository.get(article_id).id for article_id in legacy_ids] == legacy_ids
+    types = {row[0] for row in session.execute("SELECT typeof(id) FROM articles")}
+    assert types == {"blob"}
+
+
+def test_upgrade_schema_converts_ids_before_adding_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+    article_id = str(uuid.uuid1())
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE articles (id VARCHAR PRIMARY KEY, title VARCHAR, "
+            "description VARCHAR, content VARCHAR, status VARCHAR, "
+            "user_id INTEGER, created_at DATETIME, updated_at DATETIME)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO articles (id, title, description, content, status, user_id) "
+            f"VALUES ('{article_id}', 'title', 'description', 'content', 'draft', 1)"
+        )
+
+    upgrade_schema(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(select(articles.c.id)).scalars().all() == [article_id]
+        assert connection.exec_driver_sql("SELECT typeof(id) FROM articles").scalar() == "blob"
+    assert inspect(engine).has_table("article_terms")
+
+
+def test_upgrade_schema_creates_a_fresh_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'blog.db'}")
+
+    upgrade_schema(engine)
+
+    assert set(inspect(engine).get_table_names()) >= {"articles", "article_terms"}
+
+
+def test_new_article_ids_are_time_ordered():
+    ids = [get_new_uuid() for _ in range(1000)]
+    assert ids == sorted(ids)
+    assert {uuid.UUID(article_id).version for article_id in ids} == {7}
@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import select
+
+from blog.adapters.orm import article_terms
+from blog.adapters.schema import full_scans, query_plan
+from blog.adapters.repositories import _search_statement
+from blog.domain import commands
+from blog.domain.models import ArticleStatus, get_new_uuid
+from blog.services.batch import execute_batch
+from blog.services.handlers import (
+    create_user,
+    add_article,
+    publish_article,
+    delete_article,
+    archive_article,
+    rebuild_search_index,
+)
+from blog.services.unit_of_work import BlogUnitOfWork
+
+
+@pytest.fixture
+def uow(session_factory):
+    return BlogUnitOfWork(session_factory)
+
+
+@pytest.fixture
+def user_id(uow, session):
+    return create_user(commands.CreateUser('Jon', 'Snow'), uow)
+
+
+def _add_article(uow, user_id, title, content="content"):
+    return add_article(
+        commands.AddArticle(title, "description", content, user_id), uow
+    )
+
+
+def _search(uow, query, **kwargs):
+    with uow:
+        return uow.search.search(query, **kwargs)
+
+
+def test_search_ranks_articles_matching_more_terms_first(uow, user_id):
+    both = _add_article(uow, user_id, "Python packaging", "wheels and sdists")
+    title = _add_article(uow, user_id, "Python decorators")
+    content = _add_article(uow, user_id, "Decorators", "a python decorator")
+    _add_article(uow, user_id, "Rust lifetimes")
+
+    assert _search(uow, "python packaging") == [both, title, content]
+    assert _search(uow, "decorators") == [title, content]
+    assert _search(uow, "python", limit=1) == [both]
+    assert _search(uow, "haskell") == []
+    assert _search(uow, "the of") == []
+
+
+def test_status_changes_update_the_index(uow, user_id):
+    published = _add_article(uow, user_id, "Python")
+    archived = _add_article(uow, user_id, "Python")
+    deleted = _add_article(uow, user_id, "Python")
+    draft = _add_article(uow, user_id, "Python")
+    publish_article(commands.PublishArticle(published, user_id), uow)
+    publish_article(commands.PublishArticle(archived, user_id), uow)
+    archive_article(commands.ArchiveArticle(archived, user_id), uow)
+    delete_article(commands.DeleteArticle(deleted, user_id), uow)
+
+    assert _search(uow, "python", status=ArticleStatus.PUBLISHED) == [published]
+    assert _search(uow, "python", status=ArticleStatus.ARCHIVED) == [archived]
+    assert _search(uow, "python", status=ArticleStatus.DRAFT) == [draft]
+    assert deleted not in _search(uow, "python")
+
+
+def test_batch_updates_the_index(uow, user_id):
+    article_id = _add_article(uow, user_id, "Python")
+    result = execute_batch(
+        [
+            commands.AddArticle("Python batch", "description", "content", user_id),
+            commands.PublishArticle(article_id, user_id),
+        ],
+        uow,
+    )
+
+    assert _search(uow, "python", status=ArticleStatus.PUBLISHED) == [article_id]
+    assert _search(uow, "batch") == [result.results[0]]
+
+
+def test_rebuild_indexes_existing_articles(uow, user_id, session):
+    article_id = _add_article(uow, user_id, "Python")
+    deleted = _add_article(uow, user_id, "Python")
+    delete_article(commands.DeleteArticle(deleted, user_id), uow)
+    session.execute(article_terms.delete())
+    session.commit()
+    assert _search(uow, "python") == []
+
+    rebuild_search_index(commands.RebuildSearchIndex(), uow)
+
+    assert _search(uow, "python") == [article_id]
+
+
+def test_search_seeks_the_postings_index(session):
+    statement = _search_statement([("python", 3), ("tips", 1)], ArticleStatus.PUBLISHED, 20)
+    plan = query_plan(session.connection(), statement)
+    # only the matched postings get grouped and sorted, never the whole table
+    assert plan[0].startswith("SEARCH article_terms")
+    assert not any(line.startswith("SCAN") for line in plan)
+    assert full_scans(
+        session.connection(),
+        select(article_terms.c.term).where(article_terms.c.article_id == get_new_uuid()),
+    ) == []
@@ -1,11 +1,13 @@
 import pytest
+from sqlalchemy import event
 
 from blog.adapters.repositories import SqlAlchemyRepository
-from blog.domain import commands
+from blog.domain import commands, events
 from blog.domain.exceptions import (
     InvalidStatusException,
     PermissionDeniedException,
     ArticleNotFoundException,
+    UserNotFoundException,
 )
 from blog.domain.models import User, Article, ArticleStatus, get_new_uuid
 from blog.services.handlers import (
@@ -14,6 +16,9 @@ from blog.services.handlers import (
     publish_article,
     delete_article,
     archive_article,
+    publish_articles,
+    delete_articles,
+    archive_articles,
 )
 from blog.services.unit_of_work import BlogUnitOfWork
 
@@ -59,6 +64,44 @@ def test_user_add_article(user_repository, uow):
     assert len(user.articles)
 
 
+def test_raise_not_found_when_adding_article_to_non_existing_user(uow, session):
+    cmd = commands.AddArticle(
+        "Learning Python",
+        "article description",
+        "article content",
+        123,
+    )
+    with pytest.raises(UserNotFoundException):
+        add_article(cmd, uow)
+
+
+def test_add_article_does_not_load_existing_user_articles(
+    uow, session, in_memory_db
+):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    cmd = commands.AddArticle(
+        "Learning Python",
+        "article description",
+        "article content",
+        user_id,
+    )
+    for _ in range(3):
+        add_article(cmd, uow)
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(in_memory_db, "before_cursor_execute", record)
+    try:
+        add_article(cmd, uow)
+    finally:
+        event.remove(in_memory_db, "before_cursor_execute", record)
+
+    assert not [s for s in statements if "FROM articles" in s]
+
+
 def test_publish_article(uow, user_repository, article_repository):
     cmd = commands.CreateUser('Jon', 'Snow')
     user_id = create_user(cmd, uow)
@@ -110,6 +153,13 @@ def test_raise_not_found_when_publishing_non_existing_article(
         publish_article(cmd, uow)
 
 
+def test_raise_not_found_when_publishing_malformed_article_id(uow):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+
+    with pytest.raises(ArticleNotFoundException):
+        publish_article(commands.PublishArticle("invalid", user_id), uow)
+
+
 def test_raise_permission_denied_when_publishing_article_by_different_user(
     uow, user_repository, article_repository
 ):
@@ -272,3 +322,62 @@ def test_raise_not_found_when_archiving_non_existing_article(
     with pytest.raises(ArticleNotFoundException):
         cmd = commands.ArchiveArticle(invalid_article_id, user_id)
         archive_article(cmd, uow)
+
+
+def _add_articles(uow, user_id, count):
+    return [
+        add_article(
+            commands.AddArticle("title", "description", "content", user_id), uow
+        )
+        for _ in range(count)
+    ]
+
+
+def test_publish_many_articles_in_one_command(uow, article_repository):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    article_ids = _add_articles(uow, user_id, 3)
+
+    publish_articles(commands.PublishArticles(article_ids, user_id), uow)
+
+    assert {
+        article_repository.get(article_id).status for article_id in article_ids
+    } == {ArticleStatus.PUBLISHED}
+    assert [type(event) for event in uow.collect_new_events()] == [
+        events.ArticlePublished
+    ] * 3
+
+
+def test_bulk_transition_is_all_or_nothing(uow, session, article_repository):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    draft, published = _add_articles(uow, user_id, 2)
+    publish_article(commands.PublishArticle(published, user_id), uow)
+
+    with pytest.raises(InvalidStatusException):
+        publish_articles(commands.PublishArticles([draft, published], user_id), uow)
+    with pytest.raises(ArticleNotFoundException):
+        archive_articles(
+            commands.ArchiveArticles([published, get_new_uuid()], user_id), uow
+        )
+    with pytest.raises(PermissionDeniedException):
+        delete_articles(commands.DeleteArticles([draft], 123), uow)
+
+    session.expire_all()
+    assert article_repository.get(draft).status == ArticleStatus.DRAFT
+    assert article_repository.get(published).status == ArticleStatus.PUBLISHED
+
+
+def test_transition_does_not_load_the_article(uow, session):
+    user_id = create_user(commands.CreateUser('Jon', 'Snow'), uow)
+    article_id, = _add_articles(uow, user_id, 1)
+    statements = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    publish_article(commands.PublishArticle(article_id, user_id), uow)
+
+    assert [statement.split()[0] for statement in statements] == [
+        "UPDATE", "INSERT", "UPDATE", "INSERT"
+    ]
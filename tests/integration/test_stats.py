@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import event
+
+from blog.domain import commands
+from blog.domain.models import ArticleStats
+from blog.services.batch import execute_batch
+from blog.services.handlers import (
+    create_user,
+    add_article,
+    publish_article,
+    delete_article,
+    archive_article,
+    rebuild_article_stats,
+)
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import article_stats
+
+
+@pytest.fixture
+def uow(session_factory):
+    return BlogUnitOfWork(session_factory)
+
+
+@pytest.fixture
+def user_id(uow, session):
+    return create_user(commands.CreateUser('Jon', 'Snow'), uow)
+
+
+def _add_article(uow, user_id):
+    cmd = commands.AddArticle("title", "description", "content", user_id)
+    return add_article(cmd, uow)
+
+
+def test_new_user_has_empty_stats(uow, user_id):
+    assert article_stats(user_id, uow) == ArticleStats(user_id)
+
+
+def test_handlers_maintain_stats(uow, user_id):
+    archived, deleted, published, _ = (_add_article(uow, user_id) for _ in range(4))
+    publish_article(commands.PublishArticle(archived, user_id), uow)
+    archive_article(commands.ArchiveArticle(archived, user_id), uow)
+    delete_article(commands.DeleteArticle(deleted, user_id), uow)
+    publish_article(commands.PublishArticle(published, user_id), uow)
+
+    assert article_stats(user_id, uow) == ArticleStats(
+        user_id, draft=1, published=1, archived=1, deleted=1
+    )
+
+
+def test_batch_maintains_stats(uow, user_id):
+    article_id = _add_article(uow, user_id)
+    execute_batch(
+        [
+            commands.PublishArticle(article_id, user_id),
+            commands.AddArticle("title", "description", "content", user_id),
+            commands.AddArticle("title", "description", "content", user_id),
+            commands.DeleteArticle(article_id, user_id),
+        ],
+        uow,
+    )
+
+    assert article_stats(user_id, uow) == ArticleStats(user_id, draft=2, published=1)
+
+
+def test_rebuild_recomputes_stats_from_articles(uow, user_id, session):
+    article_id = _add_article(uow, user_id)
+    _add_article(uow, user_id)
+    publish_article(commands.PublishArticle(article_id, user_id), uow)
+    other_user_id = create_user(commands.CreateUser('Arya', 'Stark'), uow)
+    session.execute("DELETE FROM article_stats")
+    session.commit()
+
+    rebuild_article_stats(commands.RebuildArticleStats(), uow)
+
+    assert article_stats(user_id, uow) == ArticleStats(user_id, draft=1, published=1)
+    assert article_stats(other_user_id, uow) == ArticleStats(other_user_id)
+
+
+def test_increment_upserts_in_one_statement(uow, user_id, in_memory_db):
+    statements = []
+    event.listen(
+        in_memory_db, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    with uow:
+        uow.stats.increment(user_id, draft=2)
+        uow.stats.increment(user_id, draft=-1, published=1)
+        uow.commit()
+
+    assert article_stats(user_id, uow) == ArticleStats(user_id, draft=1, published=1)
+    writes = [s for s in statements if not s.startswith("SELECT")]
+    assert len(writes) == 2
+    assert all("ON CONFLICT" in s for s in writes)
@@ -0,0 +1,139 @@
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from blog.adapters.orm import articles, cold_articles
+from blog.domain import commands
+from blog.domain.exceptions import InvalidStatusException
+from blog.domain.models import ArticleStats, ArticleStatus, get_new_uuid
+from blog.services.export import export_articles
+from blog.services.handlers import (
+    add_article,
+    archive_article,
+    create_user,
+    delete_article,
+    publish_article,
+    rebuild_article_stats,
+)
+from blog.services.tiering import move_cold_articles
+from blog.services.unit_of_work import BlogUnitOfWork
+from blog.services.views import article_stats
+
+
+@pytest.fixture
+def uow(session_factory):
+    return BlogUnitOfWork(session_factory)
+
+
+@pytest.fixture
+def user_id(uow, session):
+    return create_user(commands.CreateUser('Jon', 'Snow'), uow)
+
+
+def _article(uow, user_id, *transitions):
+    article_id = add_article(
+        commands.AddArticle("Python tips", "description", "content", user_id), uow
+    )
+    for handler, command in transitions:
+        handler(command(article_id, user_id), uow)
+    return article_id
+
+
+@pytest.fixture
+def tiers(uow, user_id):
+    return {
+        "draft": _article(uow, user_id),
+        "published": _article(uow, user_id, (publish_article, commands.PublishArticle)),
+        "archived": _article(
+            uow, user_id,
+            (publish_article, commands.PublishArticle),
+            (archive_article, commands.ArchiveArticle),
+        ),
+        "deleted": _article(uow, user_id, (delete_article, commands.DeleteArticle)),
+    }
+
+
+def _count(session, table):
+    return session.execute(select(func.count()).select_from(table)).scalar()
+
+
+def test_moves_old_archived_and_deleted_articles(uow, tiers, session):
+    later = datetime.utcnow() + timedelta(days=31)
+
+    assert move_cold_articles(uow, timedelta(days=30), pause=0) == 0
+    assert move_cold_articles(uow, timedelta(days=30), pause=0, now=later) == 2
+
+    hot = set(session.execute(select(articles.c.id)).scalars())
+    cold = set(session.execute(select(cold_articles.c.id)).scalars())
+    assert hot == {tiers["draft"], tiers["published"]}
+    assert cold == {tiers["archived"], tiers["deleted"]}
+
+
+def test_moves_in_batches(uow, user_id, session):
+    for _ in range(5):
+        _article(uow, user_id, (delete_article, commands.DeleteArticle))
+
+    moved = move_cold_articles(uow, timedelta(0), batch_size=2, pause=0)
+
+    assert moved == 5
+    assert _count(session, articles) == 0
+    assert _count(session, cold_articles) == 5
+
+
+def test_get_falls_back_to_the_cold_table(uow, tiers, user_id):
+    move_cold_articles(uow, timedelta(0), pause=0)
+
+    with uow:
+        article = uow.articles.get(tiers["archived"])
+        assert article.status == ArticleStatus.ARCHIVED
+        assert article.user_id == user_id
+        assert article.content == "content"
+        assert article not in uow.session
+        assert uow.articles.get(tiers["published"]).status == ArticleStatus.PUBLISHED
+        assert uow.articles.get(get_new_uuid()) is None
+
+
+def test_cold_articles_leave_the_search_index_but_keep_their_stats(
+    uow, tiers, user_id
+):
+    move_cold_articles(uow, timedelta(0), pause=0)
+    rebuild_article_stats(commands.RebuildArticleStats(), uow)
+
+    with uow:
+        assert set(uow.search.search("python")) == {tiers["draft"], tiers["published"]}
+    assert article_stats(user_id, uow) == ArticleStats(
+        user_id, draft=1, published=1, archived=1, deleted=1
+    )
+
+
+def test_transitions_on_cold_articles_report_their_status(uow, tiers, user_id):
+    move_cold_articles(uow, timedelta(0), pause=0)
+
+    with pytest.raises(InvalidStatusException):
+        archive_article(commands.ArchiveArticle(tiers["archived"], user_id), uow)
+
+
+def test_exports_include_cold_articles(uow, tiers):
+    move_cold_articles(uow, timedelta(0), pause=0)
+
+    def exported(**filters):
+        out = io.StringIO()
+        export_articles(out, uow, chunk_size=1, **filters)
+        return {json.loads(line)["id"] for line in out.getvalue().splitlines()}
+
+    assert exported() == set(tiers.values())
+    assert exported(status=ArticleStatus.ARCHIVED) == {tiers["archived"]}
+    assert exported(status=ArticleStatus.DRAFT) == {tiers["draft"]}
+
+
+def test_listings_leave_out_cold_articles(uow, tiers, user_id):
+    move_cold_articles(uow, timedelta(0), pause=0)
+
+    with uow:
+        listed = {article.id for article in uow.articles.list(user_id=user_id).items}
+        summaries = uow.articles.list_summaries(status=ArticleStatus.ARCHIVED).items
+    assert listed == {tiers["draft"], tiers["published"]}
+    assert summaries == []
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+from blog.domain import commands
+from blog.services.bulk_import import parse_record, read_records
+
+
+def test_parse_record_builds_the_command():
+    assert parse_record(
+        {"type": "article", "title": "t", "description": "d", "content": "c", "user_id": "3"}
+    ) == commands.AddArticle("t", "d", "c", 3)
+    assert parse_record(
+        {"first_name": "Jon", "last_name": "Snow"}, record_type="user"
+    ) == commands.CreateUser("Jon", "Snow")
+    assert parse_record(
+        '{"type": "user", "first_name": "Jon", "last_name": "Snow"}\n'
+    ) == commands.CreateUser("Jon", "Snow")
+
+
+@pytest.mark.parametrize("record", [
+    {"type": "post", "title": "t"},
+    {"type": "user", "first_name": "Jon"},
+    {"type": "user", "first_name": "Jon", "last_name": "Snow", "age": 3},
+    {"type": "user", "first_name": "Jon", "last_name": 3},
+    {"type": "article", "title": "t", "description": "d", "content": "c", "user_id": "x"},
+    '{bad json\n',
+    '["user", "Jon", "Snow"]\n',
+])
+def test_parse_record_rejects_invalid_records(record):
+    with pytest.raises(ValueError):
+        parse_record(record)
+
+
+def test_read_records_from_ndjson_and_csv():
+    ndjson = io.StringIO('{"type": "user", "first_name": "Jon"}\n\n{bad json\n')
+    assert list(read_records(ndjson, "ndjson")) == [
+        '{"type": "user", "first_name": "Jon"}\n', '{bad json\n',
+    ]
+
+    text = io.StringIO("type,first_name,user_id\nuser,Jon,\narticle,,3\n")
+    assert list(read_records(text, "csv")) == [
+        {"type": "user", "first_name": "Jon"}, {"type": "article", "user_id": "3"},
+    ]
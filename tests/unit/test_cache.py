@@ -0,0 +1,62 @@
+from blog.adapters.cache import EntityCache
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_cached_value_and_counts_hits():
+    cache = EntityCache()
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_dropped_when_full():
+    cache = EntityCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = EntityCache(ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now = 9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert not len(cache)
+
+
+def test_evict_only_removes_given_keys():
+    cache = EntityCache()
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.evict(["a", "missing"])
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+def test_stats_report_hit_rate():
+    cache = EntityCache()
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 2 / 3
@@ -0,0 +1,38 @@
+from blog.config import (
+    PoolSettings, get_database_uri, get_pool_settings, get_replica_uris,
+)
+
+
+def test_database_port_comes_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_PORT", "6543")
+    assert ":6543/" in get_database_uri()
+
+
+def test_pool_settings_defaults(monkeypatch):
+    for name in (
+        "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT",
+        "DB_POOL_RECYCLE", "DB_POOL_PRE_PING", "DB_STATEMENT_TIMEOUT_MS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    assert get_pool_settings() == PoolSettings()
+
+
+def test_pool_settings_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+
+    settings = get_pool_settings()
+    assert settings.size == 20
+    assert settings.max_overflow == 0
+    assert settings.pre_ping is False
+    assert settings.statement_timeout_ms == 5000
+
+
+def test_replica_uris_from_environment(monkeypatch):
+    monkeypatch.delenv("DATABASE_REPLICA_URIS", raising=False)
+    assert get_replica_uris() == []
+
+    monkeypatch.setenv("DATABASE_REPLICA_URIS", "sqlite:///a.db, sqlite:///b.db")
+    assert get_replica_uris() == ["sqlite:///a.db", "sqlite:///b.db"]
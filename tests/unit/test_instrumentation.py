@@ -0,0 +1,28 @@
+from blog.adapters.instrumentation import Histogram, Instrumentation, command_label
+
+
+def test_histogram_counts_values_into_buckets():
+    histogram = Histogram([1, 10, 100])
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+
+    assert histogram.counts == [1, 2, 1, 1]
+    assert histogram.count == 5
+    assert histogram.sum == 560.5
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(100) == float("inf")
+
+
+def test_metrics_are_aggregated_per_command():
+    instrumentation = Instrumentation()
+    with command_label("CreateUser"):
+        metrics = instrumentation.start()
+        metrics.statements = 3
+        instrumentation.finish(metrics)
+    metrics = instrumentation.start()
+    instrumentation.finish(metrics)
+
+    exported = instrumentation.export()
+    assert exported["CreateUser"]["statements"]["sum"] == 3
+    assert exported["CreateUser"]["total_seconds"]["count"] == 1
+    assert exported["unknown"]["statements"]["count"] == 1
@@ -1,29 +1,19 @@
-from dataclasses import field, dataclass
-from typing import Union, Dict, Type, List, Callable
-
 import pytest
 
-from blog.domain import commands
-from blog.domain.commands import Command
+from blog.domain import commands, events
 from blog.services.handlers import create_user
+from blog.services.message_bus import MessageBus, bootstrap, COMMAND_HANDLERS
 from blog.services.unit_of_work import BlogUnitOfWork
 
-Message = Union[Command]
-
 
-@dataclass
-class MessageBus:
-    handlers: Dict[Type[Message], List[Callable]] = field(default_factory=dict)
-    queue: [Message] = field(default_factory=list)
+class FakeUnitOfWork:
 
-    def subscribe(self, event: Type[Message], fn: Callable):
-        if event not in self.handlers:
-            self.handlers[event] = [fn]
-            return
-        self.handlers[event].append(fn)
+    def __init__(self):
+        self.new_events = []
 
-    def handle(self, message: Message):
-        pass
+    def collect_new_events(self):
+        while self.new_events:
+            yield self.new_events.pop(0)
 
 
 @pytest.fixture
@@ -47,10 +37,67 @@ def test_has_commands_after_registering():
     assert commands.CreateUser in bus.handlers
 
 
-# Todo
-def test_trigger_callable():
-    bus = MessageBus()
+def test_trigger_callable(uow, session):
+    bus = MessageBus(uow=uow)
     bus.subscribe(commands.CreateUser, create_user)
 
     cmd = commands.CreateUser('Jon', 'Snow')
-    bus.handle(cmd)
+    user_id = bus.handle(cmd)
+    assert user_id
+
+
+def test_bootstrap_registers_every_command(uow):
+    bus = bootstrap(uow)
+    for command in commands.Command.__subclasses__():
+        assert command in COMMAND_HANDLERS
+        assert bus.handlers[command] == [COMMAND_HANDLERS[command]]
+
+
+def test_drains_events_raised_by_command_handler():
+    uow = FakeUnitOfWork()
+    handled = []
+
+    def add_article(cmd, uow):
+        uow.new_events.append(events.ArticleAdded('article-id', cmd.user_id))
+        return 'article-id'
+
+    bus = MessageBus(uow=uow)
+    bus.subscribe(commands.AddArticle, add_article)
+    bus.subscribe(events.ArticleAdded, lambda event, uow: handled.append(event))
+
+    result = bus.handle(commands.AddArticle('title', 'description', 'content', 1))
+
+    assert result == 'article-id'
+    assert handled == [events.ArticleAdded('article-id', 1)]
+    assert not bus.queue
+
+
+def test_event_handler_failure_does_not_stop_other_handlers():
+    handled = []
+
+    def failing(event, uow):
+        raise RuntimeError
+
+    bus = MessageBus(uow=FakeUnitOfWork())
+    bus.subscribe(events.ArticlePublished, failing)
+    bus.subscribe(events.ArticlePublished, lambda event, uow: handled.append(event))
+
+    bus.handle(events.ArticlePublished('article-id', 1))
+    assert handled == [events.ArticlePublished('article-id', 1)]
+
+
+def test_raises_for_command_without_handler():
+    bus = MessageBus(uow=FakeUnitOfWork())
+    with pytest.raises(LookupError):
+        bus.handle(commands.CreateUser('Jon', 'Snow'))
+    assert not bus.queue
+
+
+def test_bus_is_reusable_across_commands(uow, session):
+    bus = bootstrap(uow)
+    user_id = bus.handle(commands.CreateUser('Jon', 'Snow'))
+    article_id = bus.handle(
+        commands.AddArticle('title', 'description', 'content', user_id)
+    )
+    bus.handle(commands.PublishArticle(article_id, user_id))
+    assert not bus.queue
@@ -0,0 +1,15 @@
+from blog.adapters.search import document_terms, query_terms, tokenize
+
+
+def test_tokenize_lowercases_and_drops_stop_words():
+    assert tokenize("The Zen of Python, a guide!") == ["zen", "python", "guide"]
+
+
+def test_document_terms_weigh_title_over_content():
+    assert document_terms(
+        title="Python tips", description="", content="python python"
+    ) == {"python": 5, "tips": 3}
+
+
+def test_query_terms_are_unique_and_ordered():
+    assert query_terms("python Python tips") == ["python", "tips"]
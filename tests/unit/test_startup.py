@@ -0,0 +1,28 @@
+import subprocess
+import sys
+
+import pytest
+
+LIGHT_MODULES = [
+    "blog.services.handlers",
+    "blog.services.message_bus",
+    "blog.services.batch",
+    "blog.services.views",
+    "blog.services.export",
+    "blog.services.bulk_import",
+    "blog.services.executor",
+    "blog.services.outbox_relay",
+    "blog.services.tiering",
+]
+
+
+@pytest.mark.parametrize("module", LIGHT_MODULES)
+def test_importing_service_modules_does_not_load_sqlalchemy(module):
+    code = (
+        f"import sys, {module}; "
+        "print(any(name.startswith('sqlalchemy') for name in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"